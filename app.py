@@ -1,11 +1,12 @@
-from flask import Flask, render_template, request, send_file, redirect, url_for, render_template_string
+from flask import Flask, render_template, request, send_file, redirect, url_for, render_template_string, jsonify, abort
 from jinja2 import Template
 import os
 from datetime import datetime
 from werkzeug.utils import secure_filename
 from parse_utils import (
-    extract_events_from_pdf,
-    evaluate_all_events,
+    extract_events_from_pdf_cached,
+    load_cached_events,
+    combo_batch,
     find_combinable_pairs,
     export_pairs_to_pdf,
     export_pairs_to_csv,
@@ -13,13 +14,19 @@ from parse_utils import (
     save_html_as_pdf
 )
 from parse_bad_pdf import extract_events_from_microsoft_pdf
-from generate_triple_drop_labels import generate_triple_drop_labels, extract_meets_with_times
-from generate_time_improvement_labels import generate_time_improvement_labels, extract_meets_with_times
-from generate_fast_fishy_labels import generate_fast_fishy_labels, extract_meets_with_times
+from generate_triple_drop_labels import generate_triple_drop_labels
+from generate_fast_fishy_labels import generate_fast_fishy_labels, winners_before
+from award_rules import AWARD_RULES, evaluate_awards
 from render_labels import render_label_pdf
+from combo_engine import evaluate_combos, sweep_combos
+from session_timeline import project_sweep
+from cache_utils import file_digest
+from report_card import load_report_card, get_report_card
+from season_awards import AWARD_TYPES, season_awards, write_season_awards
 
 app = Flask(__name__)
 UPLOAD_FOLDER = "static/generated"
+REPORT_CARD_EXPIRED = "<h3>That report card upload has expired, please upload the CSV again.</h3>"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 
@@ -38,6 +45,7 @@ def combo_generator():
         uploaded_file = request.files.get("pdf")
         lanes = int(request.form.get("lanes", 6))
         aggressiveness = int(request.form.get('aggressiveness', 1))
+        optimize = request.form.get("optimize") == "1"
 
         if uploaded_file and uploaded_file.filename.endswith(".pdf"):
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -45,12 +53,15 @@ def combo_generator():
             filepath = os.path.join(UPLOAD_FOLDER, filename)
             uploaded_file.save(filepath)
 
-            events, meet_title = extract_events_from_pdf(filepath)
-            table = evaluate_all_events(events, lanes, aggressiveness)
+            digest = file_digest(filepath)
+            events, meet_title = extract_events_from_pdf_cached(filepath, digest)
+            combinable_only, table = evaluate_combos(events, lanes, aggressiveness, optimize)
+
+            # Every lanes/strategy combination, so the page can switch without re-uploading
+            sweep = project_sweep(events, sweep_combos(events, optimize=optimize))
 
             csv_path = os.path.join(UPLOAD_FOLDER, f"combo_{timestamp}.csv")
             pdf_path = os.path.join(UPLOAD_FOLDER, f"combo_{timestamp}.pdf")
-            combinable_only = find_combinable_pairs(events, lanes, aggressiveness)
             combo_count = len(combinable_only)
             export_pairs_to_csv(combinable_only, csv_path, meet_title)
             export_pairs_to_pdf(combinable_only, pdf_path, meet_title)
@@ -62,11 +73,108 @@ def combo_generator():
                 lanes=lanes,
                 csv_filename=os.path.basename(csv_path),
                 pdf_filename=os.path.basename(pdf_path),
-                combo_count=combo_count
+                combo_count=combo_count,
+                aggressiveness=aggressiveness,
+                events=[event.to_dict() for event in events],
+                sweep=sweep,
+                digest=digest,
+                optimize=optimize
             )
 
     return render_template("combo.html")
 
+@app.route("/combo-generator/sweep", methods=["POST"])
+def combo_sweep():
+    """
+    Combo results for every lanes/strategy combination as JSON.  Takes either a
+    "pdf" upload or the "digest" of a report that was uploaded before, and
+    optimize=1 for the most-combos pairing instead of event order.
+    """
+    optimize = request.form.get("optimize") == "1"
+    uploaded_file = request.files.get("pdf")
+
+    if uploaded_file and uploaded_file.filename.endswith(".pdf"):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = os.path.join(UPLOAD_FOLDER, f"SessionReport_{timestamp}.pdf")
+        uploaded_file.save(filepath)
+        digest = file_digest(filepath)
+        events, meet_title = extract_events_from_pdf_cached(filepath, digest)
+    else:
+        digest = request.form.get("digest", "")
+        cached = load_cached_events(digest)
+        if cached is None:
+            return jsonify(error="Unknown report, please upload the PDF again"), 404
+        events, meet_title = cached
+
+    return jsonify(digest=digest, meet_title=meet_title, events=[event.to_dict() for event in events], **project_sweep(events, sweep_combos(events, optimize=optimize)))
+
+@app.route("/combo-generator/export")
+def combo_export():
+    """CSV or PDF of the combos for one lanes/strategy choice of an uploaded report."""
+    cached = load_cached_events(request.args.get("digest", ""))
+    if cached is None:
+        abort(404)
+    events, meet_title = cached
+
+    lanes = int(request.args.get("lanes", 6))
+    aggressiveness = int(request.args.get("aggressiveness", 1))
+    optimize = request.args.get("optimize") == "1"
+    fmt = request.args.get("format", "csv")
+    if fmt not in ("csv", "pdf"):
+        abort(404)
+
+    combinable_only, _ = evaluate_combos(events, lanes, aggressiveness, optimize)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(UPLOAD_FOLDER, f"combo_{timestamp}_{lanes}_{aggressiveness}.{fmt}")
+    if fmt == "csv":
+        export_pairs_to_csv(combinable_only, path, meet_title)
+    else:
+        export_pairs_to_pdf(combinable_only, path, meet_title)
+
+    if not os.path.exists(path):
+        return "No combos for these settings", 404
+    return send_file(path, as_attachment=True)
+
+@app.route("/combo-generator/batch", methods=["GET", "POST"])
+def combo_generator_batch():
+    """Combos for every session report of a meet, uploaded together."""
+    if request.method == "POST":
+        lanes = int(request.form.get("lanes", 6))
+        aggressiveness = int(request.form.get("aggressiveness", 1))
+        optimize = request.form.get("optimize") == "1"
+        uploaded_files = [f for f in request.files.getlist("pdf") if f.filename.endswith(".pdf")]
+
+        if uploaded_files:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filepaths = []
+            for n, uploaded_file in enumerate(uploaded_files, start=1):
+                filepath = os.path.join(UPLOAD_FOLDER, f"SessionReport_{timestamp}_{n}.pdf")
+                uploaded_file.save(filepath)
+                filepaths.append(filepath)
+
+            sessions, pairs, meet_title = combo_batch(filepaths, lanes, aggressiveness, optimize)
+            for session, uploaded_file in zip(sessions, uploaded_files):
+                session["file"] = secure_filename(uploaded_file.filename)
+
+            csv_path = os.path.join(UPLOAD_FOLDER, f"combo_batch_{timestamp}.csv")
+            pdf_path = os.path.join(UPLOAD_FOLDER, f"combo_batch_{timestamp}.pdf")
+            export_pairs_to_csv(pairs, csv_path, meet_title)
+            export_pairs_to_pdf(pairs, pdf_path, meet_title)
+
+            return render_template(
+                "combo_batch.html",
+                sessions=sessions,
+                meet_title=meet_title,
+                combo_count=len(pairs),
+                csv_filename=os.path.basename(csv_path) if pairs else None,
+                pdf_filename=os.path.basename(pdf_path),
+                lanes=lanes,
+                aggressiveness=aggressiveness,
+                optimize=optimize
+            )
+
+    return render_template("combo_batch.html")
+
 @app.route("/triple-drop-labels", methods=["GET", "POST"])
 def triple_drop_labels():
     label_data = []
@@ -84,7 +192,8 @@ def triple_drop_labels():
                 csv_path = os.path.join(UPLOAD_FOLDER, f"report_{timestamp}.csv")
                 uploaded_file.save(csv_path)
 
-                meet_options = extract_meets_with_times(csv_path)
+                report_token, report_card = load_report_card(csv_path)
+                meet_options = report_card.meets.options
 
                 return render_template(
                     "triple_drop.html",
@@ -93,14 +202,16 @@ def triple_drop_labels():
                     label_filename="",
                     selected_meet="",
                     csv_uploaded=True,
-                    csv_path=os.path.basename(csv_path)
+                    report_token=report_token
                 )
 
-        elif "meet" in request.form and "csv_path" in request.form:
+        elif "meet" in request.form and "report_token" in request.form:
             # Step 2: user selects meet
             selected_meet = request.form["meet"]
-            csv_path = os.path.join(UPLOAD_FOLDER, request.form["csv_path"])
-            label_data = generate_triple_drop_labels(csv_path, selected_meet)
+            report_card = get_report_card(request.form["report_token"])
+            if report_card is None:
+                return REPORT_CARD_EXPIRED, 404
+            label_data = generate_triple_drop_labels(report_card, selected_meet)
 
             if label_data:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -115,7 +226,7 @@ def triple_drop_labels():
         label_filename=label_filename,
         selected_meet=selected_meet,
         csv_uploaded=False,
-        csv_path=""
+        report_token=""
     )
 
 @app.route("/time-improvement-labels", methods=["GET", "POST"])
@@ -136,7 +247,8 @@ def time_improvement_labels():
                 csv_path = os.path.join(UPLOAD_FOLDER, f"report_{timestamp}.csv")
                 uploaded_file.save(csv_path)
 
-                meet_options = extract_meets_with_times(csv_path)
+                report_token, report_card = load_report_card(csv_path)
+                meet_options = report_card.meets.options
 
                 return render_template(
                     "time_improvement.html",
@@ -145,15 +257,17 @@ def time_improvement_labels():
                     label_filename="",
                     selected_meet="",
                     csv_uploaded=True,
-                    csv_path=os.path.basename(csv_path)
+                    report_token=report_token
                 )
 
-        elif "meet" in request.form and "csv_path" in request.form:
+        elif "meet" in request.form and "report_token" in request.form:
             # Step 2: User selected a meet
             selected_meet = request.form["meet"]
-            csv_path = os.path.join(UPLOAD_FOLDER, request.form["csv_path"])
+            report_card = get_report_card(request.form["report_token"])
+            if report_card is None:
+                return REPORT_CARD_EXPIRED, 404
             # old code for time improvement ONLY
-            #label_data = generate_time_improvement_labels(csv_path, selected_meet)
+            #label_data = generate_time_improvement_labels(report_card, selected_meet)
 
             # added for new combined report
             report_types = request.form.getlist("report_types")
@@ -166,8 +280,14 @@ def time_improvement_labels():
             #    output_path = os.path.join(UPLOAD_FOLDER, label_filename)
             #    render_label_pdf(label_data, output_path)
 
+            # Every selected award comes from one meet table; Fast Fishy also needs everyone who won before
+            winners = winners_before(report_card, selected_meet) if "fast_fishy" in report_types else None
+            awards = evaluate_awards(
+                report_card, selected_meet, [award_type for award_type in report_types if award_type in AWARD_RULES], winners
+            )
+
             if "time_improvement" in report_types:
-                ti_data = generate_time_improvement_labels(csv_path, selected_meet)
+                ti_data = awards["time_improvement"]["labels"]
                 ti_filename = f"time_improvement_{timestamp}.pdf"
                 ti_path = os.path.join(UPLOAD_FOLDER, ti_filename)
                 meet_title = ti_data[0][4] + " - " + ti_data[0][3] if ti_data else ""
@@ -182,7 +302,7 @@ def time_improvement_labels():
                 generated_labels.append(("Time Improvement", ti_filename, ti_data, ti_html, ti_report_pdf))
 
             if "triple_drop" in report_types:
-                td_data = generate_triple_drop_labels(csv_path, selected_meet)
+                td_data = awards["triple_drop"]["labels"]
                 td_filename = f"triple_drop_{timestamp}.pdf"
                 td_path = os.path.join(UPLOAD_FOLDER, td_filename)
                 meet_title = td_data[0][4] + " - " + td_data[0][3] if td_data else ""
@@ -196,10 +316,10 @@ def time_improvement_labels():
                 generated_labels.append(("Triple Drop", td_filename, td_data, td_html, td_report_pdf))
 
             if "fast_fishy" in report_types:
-                #ff_data = generate_fast_fishy_labels(csv_path, selected_meet)
+                #ff_data = generate_fast_fishy_labels(report_card, selected_meet)
                 ff_filename = f"fast_fishy_{timestamp}.pdf"
                 ff_path = os.path.join(UPLOAD_FOLDER, ff_filename)
-                ff_labels, ff_df, ff_rankings = generate_fast_fishy_labels(csv_path, selected_meet)
+                ff_labels, ff_rankings = awards["fast_fishy"]["labels"], awards["fast_fishy"]["rankings"]
                 render_label_pdf(ff_labels, ff_path)
                 meet_title = ff_labels[0][4] + " - " + ff_labels[0][3] if ff_labels else ""
 
@@ -222,7 +342,7 @@ def time_improvement_labels():
         #label_filename=label_filename,
         selected_meet=selected_meet,
         csv_uploaded=False,
-        csv_path="",
+        report_token="",
         generated_labels=generated_labels
     )
 
@@ -243,7 +363,8 @@ def fast_fishy_labels():
                 csv_path = os.path.join(UPLOAD_FOLDER, f"report_{timestamp}.csv")
                 uploaded_file.save(csv_path)
 
-                meet_options = extract_meets_with_times(csv_path)
+                report_token, report_card = load_report_card(csv_path)
+                meet_options = report_card.meets.options
 
                 return render_template(
                     "fast_fishy.html",
@@ -253,13 +374,15 @@ def fast_fishy_labels():
                     meet_options=meet_options,
                     selected_meet="",
                     csv_uploaded=True,
-                    csv_path=os.path.basename(csv_path)
+                    report_token=report_token
                 )
 
-        elif "meet" in request.form and "csv_path" in request.form:
+        elif "meet" in request.form and "report_token" in request.form:
             selected_meet = request.form["meet"]
-            csv_path = os.path.join(UPLOAD_FOLDER, request.form["csv_path"])
-            label_data, _, rankings = generate_fast_fishy_labels(csv_path, selected_meet)
+            report_card = get_report_card(request.form["report_token"])
+            if report_card is None:
+                return REPORT_CARD_EXPIRED, 404
+            label_data, _, rankings = generate_fast_fishy_labels(report_card, selected_meet)
 
             if label_data:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -275,9 +398,38 @@ def fast_fishy_labels():
         meet_options=[],
         selected_meet=selected_meet,
         csv_uploaded=False,
-        csv_path=""
+        report_token=""
     )
 
+@app.route("/season-awards", methods=["GET", "POST"])
+def season_awards_batch():
+    """Award labels and reports for every meet of the season at once."""
+    if request.method == "POST":
+        uploaded_file = request.files.get("report")
+        award_types = [award_type for award_type in AWARD_TYPES if award_type in request.form.getlist("report_types")]
+
+        if uploaded_file and uploaded_file.filename.endswith(".csv") and award_types:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            csv_path = os.path.join(UPLOAD_FOLDER, f"report_{timestamp}.csv")
+            uploaded_file.save(csv_path)
+
+            _, report_card = load_report_card(csv_path)
+            awards = season_awards(report_card, award_types)
+            files = write_season_awards(awards, os.path.join(UPLOAD_FOLDER, f"season_{timestamp}"))
+
+            return render_template(
+                "season_awards.html",
+                award_types=AWARD_TYPES,
+                selected_types=award_types,
+                awards=awards,
+                files=[
+                    (AWARD_TYPES[award_type], os.path.basename(label_pdf), os.path.basename(report_pdf), count)
+                    for award_type, label_pdf, report_pdf, count in files
+                ]
+            )
+
+    return render_template("season_awards.html", award_types=AWARD_TYPES, selected_types=list(AWARD_TYPES))
+
 @app.route("/combo-generator-bad", methods=["GET", "POST"])
 def combo_generator_bad():
     debug_images = []
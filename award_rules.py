@@ -0,0 +1,169 @@
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+from report_card import clean_time
+
+
+def calculate_time_drop(prev_sec, new_sec):
+    if math.isnan(new_sec):
+        return "?"
+    drop = prev_sec - new_sec
+    if drop <= 0:
+        return "0.00s"
+    return f"-{drop:.2f}"
+
+
+def clean_age_group(age_group):
+    if pd.isna(age_group):
+        return ""
+    return re.sub(r'^0(\d)-0?(\d)', r'\1-\2', age_group)
+
+
+class AwardRule:
+    """An award, declared as a filter over the meet table and how the rows that pass become labels."""
+
+    def __init__(self, name, where, label, group_by=None, min_count=None, rank_by=None, per=None,
+                 repeat_name=None, ranking=None):
+        self.name = name                # as it's printed on the labels
+        self.where = where              # meet table -> mask of the rows that count
+        self.label = label              # label lines for a row (or a group's first row / totals)
+        self.group_by = group_by        # None for a label per row, else the column rows are grouped by
+        self.min_count = min_count      # unranked: groups with at least this many rows get a label
+        self.rank_by = rank_by          # ranked: the column summed per group to rank the groups
+        self.per = per                  # ranked: the column the rankings are split by, a winner in each
+        self.repeat_name = repeat_name  # ranked: name for a top group that has won before
+        self.ranking = ranking          # ranked: each group's line in the full rankings
+
+
+AWARD_RULES = {
+    # Every improved swim with an earlier time
+    "time_improvement": AwardRule(
+        "Time Improvement",
+        where=lambda t: t["improved"] & t["has_prior_best"],
+        label=lambda r, award: [
+            f"{r.last}, {r.first}",
+            r.event,
+            f"Previous best: {clean_time(r.prior_best_time)} ({calculate_time_drop(r.prior_best, r.seconds)})",
+            r.date,
+            r.meet
+        ]
+    ),
+    # Three or more improved swims with an earlier time
+    "triple_drop": AwardRule(
+        "Triple Drop",
+        where=lambda t: t["improved"] & t["has_prior_time"],
+        group_by="swimmer",
+        min_count=3,
+        label=lambda r, award: [r.swimmer, clean_age_group(r.age_group), award, r.date, r.meet]
+    ),
+    # Biggest summed drop per age group, excluding earlier winners.  -Improved
+    # is checked for truthiness here, so a blank one counts
+    "fast_fishy": AwardRule(
+        "Fast Fishy",
+        where=lambda t: t["any_improved"] & (t["drop"] > 0),
+        group_by="swimmer",
+        rank_by="drop",
+        per="age",
+        repeat_name="Repeat Fast Fishy",
+        label=lambda r, award: [
+            f"{r.last}, {r.first}",
+            f"{award} - {r.age}",
+            f"Total time drop: -{r.drop:.2f}s",
+            r.date,
+            r.meet
+        ],
+        ranking=lambda r: {"name": f"{r.last}, {r.first}", "drop": f"-{r.drop:.2f}s"}
+    ),
+}
+
+
+def meet_table(report_card, meet):
+    """The table every award rule filters: a line per report card row with a swim at this meet."""
+    rows = report_card.rows
+    swims = report_card.swims(meet)
+    seconds = swims["seconds"]
+    prior_best = swims["prior_best"]
+    best_meet = swims["prior_best_meet"]
+
+    # Result text of each row's best earlier swim
+    result_strings = np.append(report_card.result_strings, np.nan)
+    prior_best_time = result_strings[swims["prior_best_result"]]
+
+    age_group = rows["AgeGroup"] if "AgeGroup" in rows.columns else pd.Series("", index=rows.index)
+    return pd.DataFrame({
+        "swimmer": rows["LastName_FirstName"],
+        "last": rows["LastName"],
+        "first": rows["FirstName"],
+        "age_group": age_group,
+        "age": age_group.str.strip() if "AgeGroup" in rows.columns else age_group,
+        "event": (rows["EventDistance"].astype(str) + " " + rows["EventStroke"].astype(str)).str.strip(),
+        "improved": swims["improved"] == 1,
+        "any_improved": swims["improved"] != 0,
+        "seconds": seconds,
+        "prior_best": prior_best,
+        "drop": prior_best - seconds,
+        "prior_best_time": prior_best_time,
+        "has_prior_best": best_meet >= 0,
+        "has_prior_time": swims["has_prior_time"],
+        "date": report_card.meets.date[meet],
+        "meet": report_card.meets.name[meet],
+    }, index=rows.index)
+
+
+def rule_labels(rule, rows, winners):
+    """Labels (and rankings, for ranked awards) of one rule from its rows."""
+    if rule.group_by is None:
+        return [rule.label(r, rule.name) for r in rows.itertuples()], {}
+
+    if rule.rank_by is None:
+        counts = rows[rule.group_by].value_counts()
+        firsts = rows.drop_duplicates(rule.group_by).set_index(rule.group_by, drop=False)
+        chosen = firsts.loc[sorted(counts[counts >= rule.min_count].index)]
+        return [rule.label(r, rule.name) for r in chosen.itertuples()], {}
+
+    labels = []
+    rankings = {}
+    totals = rows.groupby([rule.per, rule.group_by]).agg({
+        rule.rank_by: "sum",
+        "last": "first",
+        "first": "first",
+        "date": "first",
+        "meet": "first"
+    }).reset_index()
+
+    for group, ranked in totals.groupby(rule.per):
+        ranked = ranked.sort_values(rule.rank_by, ascending=False)
+        ranked_rows = list(ranked.itertuples())
+        rankings[group] = [rule.ranking(r) for r in ranked_rows]
+
+        top = ranked_rows[0]
+        if len(ranked_rows) > 1 and getattr(top, rule.group_by) in winners:
+            labels.append(rule.label(top, rule.repeat_name))
+            top = next((r for r in ranked_rows[1:] if getattr(r, rule.group_by) not in winners), None)
+        if top is not None:
+            labels.append(rule.label(top, rule.name))
+            winners.add(getattr(top, rule.group_by))
+
+    return labels, rankings
+
+
+def evaluate_awards(report_card, meet, award_types, winners=None):
+    """
+    Every selected award for a meet, from one meet table.  This meet's ranked winners are
+    added to winners.
+    """
+    winners = set() if winners is None else winners
+    if meet not in report_card.meets:
+        return {award_type: {"labels": [], "rankings": {}, "rows": None} for award_type in award_types}
+
+    table = meet_table(report_card, meet)
+    awards = {}
+    for award_type in award_types:
+        rule = AWARD_RULES[award_type]
+        rows = table[rule.where(table)]
+        labels, rankings = rule_labels(rule, rows, winners)
+        awards[award_type] = {"labels": labels, "rankings": rankings, "rows": rows}
+    return awards
@@ -0,0 +1,28 @@
+import os
+import time
+import argparse
+
+from report_card import ReportCard
+from season_awards import AWARD_TYPES, season_awards, write_season_awards
+
+if __name__ == "__main__":
+    # python batch_awards.py report_card.csv --awards time_improvement fast_fishy
+    parser = argparse.ArgumentParser(description="Award labels and reports for every meet of a season.")
+    parser.add_argument("report", help="SwimTopia Athlete Report Card CSV")
+    parser.add_argument("--awards", nargs="+", choices=list(AWARD_TYPES), default=list(AWARD_TYPES))
+    parser.add_argument("--output", default="season_awards", help="prefix for the PDF files")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+
+    started = time.perf_counter()
+    report_card = ReportCard.from_csv(args.report)
+    awards = season_awards(report_card, [award_type for award_type in AWARD_TYPES if award_type in args.awards])
+
+    for award_type, meet_awards in awards.items():
+        for meet in meet_awards:
+            print(f"🏅 {AWARD_TYPES[award_type]} - {meet['meet_title']}: {len(meet['labels'])} labels")
+
+    for award_type, label_pdf, report_pdf, count in write_season_awards(awards, args.output):
+        print(f"📄 {AWARD_TYPES[award_type]}: {count} labels in {label_pdf}, report in {report_pdf}")
+    print(f"⏱️ {len(report_card.meets.options)} meets in {time.perf_counter() - started:.1f}s")
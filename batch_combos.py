@@ -0,0 +1,29 @@
+import os
+import time
+import argparse
+
+from parse_utils import combo_batch, export_pairs_to_csv, export_pairs_to_pdf
+
+if __name__ == "__main__":
+    # python batch_combos.py AM.pdf PM.pdf --lanes 6 --aggressiveness 1
+    parser = argparse.ArgumentParser(description="Find combos in every session report of a meet.")
+    parser.add_argument("pdfs", nargs="+", help="session report PDFs")
+    parser.add_argument("--lanes", type=int, default=6)
+    parser.add_argument("--aggressiveness", type=int, choices=[1, 2, 3], default=1)
+    parser.add_argument("--optimize", action="store_true", help="most combos possible instead of event order")
+    parser.add_argument("--output", default="combinable_events", help="prefix for the CSV/PDF files")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+
+    started = time.perf_counter()
+    sessions, pairs, meet_title = combo_batch(args.pdfs, args.lanes, args.aggressiveness, args.optimize)
+
+    for session in sessions:
+        print(f"🏊 {session['file']} ({session['meet_title']}): {len(session['pairs'])} combo event pairs")
+        stem = os.path.splitext(session["file"])[0]
+        export_pairs_to_csv(session["pairs"], f"{args.output}_{stem}.csv", session["meet_title"])
+
+    export_pairs_to_csv(pairs, f"{args.output}.csv", meet_title)
+    export_pairs_to_pdf(pairs, f"{args.output}.pdf", meet_title)
+    print(f"⏱️ {len(sessions)} session reports, {len(pairs)} combo event pairs in {time.perf_counter() - started:.1f}s")
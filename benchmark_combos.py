@@ -0,0 +1,67 @@
+import sys
+import time
+import random
+
+from combo_engine import evaluate_combos
+from session_event import SessionEvent
+
+AGE_GROUPS = ["6 & Under", "7-8", "9-10", "11-12", "13-14", "15-18"]
+STROKES = [("25yd", "Freestyle"), ("25yd", "Backstroke"), ("50yd", "Freestyle"),
+           ("50yd", "Breaststroke"), ("50yd", "Butterfly"), ("100yd", "Individual Medley")]
+
+
+def synthetic_session(event_count, seed=0):
+    """
+    An invitational-style session: the same girls/boys events repeat across
+    flights, so most female events have several possible male partners.
+    """
+    rnd = random.Random(seed)
+    rows = []
+    while len(rows) < event_count:
+        for distance, stroke in STROKES:
+            for age_group in AGE_GROUPS:
+                for gender in ("Girls", "Boys"):
+                    rows.append((gender, age_group, distance, stroke, rnd.randint(0, 30)))
+    # Shuffle within flights so the female/male order isn't always ideal
+    for start in range(0, len(rows), 24):
+        block = rows[start:start + 24]
+        rnd.shuffle(block)
+        rows[start:start + 24] = block
+    return [
+        SessionEvent(number, gender, age_group, distance, stroke, entries, max(1, -(-entries // 6)))
+        for number, (gender, age_group, distance, stroke, entries) in enumerate(rows[:event_count], start=1)
+    ]
+
+
+def total_heats(events, table, lanes):
+    heats = sum(-(-event.entries // lanes) for event in events)
+    return heats - sum(1 for row in table if row["Can Combine?"] == "Yes")
+
+
+def benchmark(events, label):
+    print(f"\n{label}: {len(events)} events")
+    print(f"{'lanes':>5} {'strategy':>8} {'greedy heats':>13} {'optimal heats':>14} {'greedy ms':>10} {'optimal ms':>11}")
+    for lanes in range(4, 11):
+        for aggressiveness in (1, 2, 3):
+            started = time.perf_counter()
+            _, greedy_table = evaluate_combos(events, lanes, aggressiveness)
+            greedy_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            _, optimal_table = evaluate_combos(events, lanes, aggressiveness, optimize=True)
+            optimal_ms = (time.perf_counter() - started) * 1000
+
+            print(f"{lanes:>5} {aggressiveness:>8} {total_heats(events, greedy_table, lanes):>13} "
+                  f"{total_heats(events, optimal_table, lanes):>14} {greedy_ms:>10.1f} {optimal_ms:>11.1f}")
+
+
+if __name__ == "__main__":
+    # python benchmark_combos.py [SessionReport.pdf ...]
+    if len(sys.argv) > 1:
+        from parse_utils import extract_events_from_pdf
+        for pdf_path in sys.argv[1:]:
+            events, meet_title = extract_events_from_pdf(pdf_path)
+            benchmark(events, meet_title)
+    else:
+        for event_count in (100, 500, 2000):
+            benchmark(synthetic_session(event_count, seed=event_count), "Synthetic session")
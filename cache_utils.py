@@ -0,0 +1,111 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+CACHE_FOLDER = os.environ.get("CACHE_FOLDER", "cache")
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in chunks."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class DiskCache:
+    """
+    A directory of cache entries, one file per key, evicted least-recently-used.
+    group maps a file name to a group whose files are evicted together.
+    """
+
+    def __init__(self, name, max_bytes, max_age=None, suffix=".json", group=None):
+        self.folder = os.path.join(CACHE_FOLDER, name)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.suffix = suffix
+        self.group = group
+        os.makedirs(self.folder, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.folder, f"{key}{self.suffix}")
+
+    def get(self, key):
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def get_path(self, key):
+        """Path of a fresh entry, for reading it in place (e.g. memory-mapping), or None."""
+        path = self.path(key)
+        try:
+            if self.max_age is not None and time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                return None
+            # Bump the mtime, so evicting the oldest first is least-recently-used
+            os.utime(path)
+            return path
+        except OSError:
+            return None
+
+    def set(self, key, data):
+        # Write to a temp file and rename, so another worker never reads half an entry
+        fd, temp_path = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, self.path(key))
+        self.evict()
+
+    def get_json(self, key):
+        data = self.get(key)
+        return json.loads(data) if data is not None else None
+
+    def set_json(self, key, value):
+        self.set(key, json.dumps(value).encode("utf-8"))
+
+    def evict(self):
+        groups = {}
+        for entry in os.scandir(self.folder):
+            # .tmp files are entries still being written by set()
+            if not entry.name.endswith(self.suffix) or entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            # A group is as old as its newest file, and its files go together
+            group = self.group(entry.name) if self.group else entry.path
+            mtime, size, paths = groups.get(group, (0, 0, []))
+            groups[group] = (max(mtime, stat.st_mtime), size + stat.st_size, paths + [entry.path])
+
+        entries = []
+        now = time.time()
+        for mtime, size, paths in groups.values():
+            if self.max_age is not None and now - mtime > self.max_age:
+                for path in paths:
+                    self._remove(path)
+                continue
+            entries.append((mtime, size, paths))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, paths in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in paths:
+                self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
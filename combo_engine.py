@@ -0,0 +1,391 @@
+from bisect import bisect_right
+
+import numpy as np
+
+FEMALE_GENDERS = ("Girls", "Women")
+MALE_GENDERS = ("Boys", "Men")
+
+
+def event_key(event):
+    return (event.age_group, event.distance, event.stroke)
+
+
+def build_male_index(events):
+    """Positions of the male events, grouped by (Age Group, Distance, Stroke), in event order."""
+    index = {}
+    for position, event in enumerate(events):
+        if event.gender in MALE_GENDERS:
+            index.setdefault(event_key(event), []).append(position)
+    return index
+
+
+def combo_reason(female_entries, male_entries, lanes, aggressiveness):
+    """Why a female/male pair can't be combined, or None if it can."""
+    r1 = female_entries % lanes
+    r2 = male_entries % lanes
+
+    if female_entries < 1 or male_entries < 1:
+        return "One event has 0 entries"
+    if r1 == 0 or r2 == 0:
+        return "One event fills all lanes"
+    if r1 + r2 > lanes:
+        return "Too many remainder swimmers"
+    if r1 < aggressiveness or r2 < aggressiveness:
+        return "Combo strategy too conservative"
+    return None
+
+
+def make_pair(female, male, lanes):
+    return {
+        "Female Event #": female.number,
+        "Female Age": f"{female.gender} {female.age_group}",
+        "Female Heat #": female.heats,
+        "Female # Swimmers": female.entries % lanes,
+        "combine with": "combine with",
+        "Male Event #": male.number,
+        "Male Age": f"{male.gender} {male.age_group}",
+        "Male Heat #": 1,
+        "Male # Swimmers": male.entries % lanes,
+        "Distance": female.distance,
+        "Stroke": female.stroke
+    }
+
+
+def combo_pass(events, index, lanes, aggressiveness):
+    """
+    One greedy pass over the events.  Returns (pairs, rows) as event positions:
+    every compatible (female, male) pair and the table's (event, can_combine, reason, is_partner).
+    """
+    pairs = []
+    rows = []
+    used_male_ids = set()
+
+    for i, e1 in enumerate(events):
+        if e1.gender in MALE_GENDERS and e1.number in used_male_ids:
+            continue  # already paired and added
+
+        # Only female events initiate a combo
+        if e1.gender not in FEMALE_GENDERS:
+            rows.append((i, "", "", False))
+            continue
+
+        positions = index.get(event_key(e1), [])
+        later = positions[bisect_right(positions, i):]
+
+        if e1.entries >= 1:
+            for position in later:
+                e2 = events[position]
+                if e2.entries >= 1 and combo_reason(e1.entries, e2.entries, lanes, aggressiveness) is None:
+                    pairs.append((i, position))
+
+        matching = next((position for position in later
+                         if events[position].number not in used_male_ids), None)
+
+        if matching is None:
+            rows.append((i, "No", "No male counterpart", False))
+            continue
+
+        e2 = events[matching]
+        reason = combo_reason(e1.entries, e2.entries, lanes, aggressiveness)
+        if reason:
+            rows.append((i, "No", reason, False))
+            continue
+
+        used_male_ids.add(e2.number)
+        rows.append((i, "Yes", f"{e1.entries % lanes} swimmers", False))
+        rows.append((matching, "", f"{e2.entries % lanes} swimmers", True))
+
+    return pairs, rows
+
+
+class ComboRow:
+    """A combo table row: the event's columns plus "Can Combine?" and "Reason", read like a dict."""
+
+    __slots__ = ("event", "can_combine", "reason", "is_partner")
+
+    def __init__(self, event, can_combine, reason, is_partner):
+        self.event = event
+        self.can_combine = can_combine
+        self.reason = reason
+        self.is_partner = is_partner
+
+    def __getitem__(self, column):
+        if column == "Can Combine?":
+            return self.can_combine
+        if column == "Reason":
+            return self.reason
+        if column == "_highlight_partner" and self.is_partner:
+            return True  # internal only, highlights the partner row
+        return self.event[column]
+
+    def get(self, column, default=None):
+        try:
+            return self[column]
+        except KeyError:
+            return default
+
+    def keys(self):
+        columns = [*self.event.keys(), "Can Combine?", "Reason"]
+        if self.is_partner:
+            columns.append("_highlight_partner")
+        return columns
+
+    def items(self):
+        return [(column, self[column]) for column in self.keys()]
+
+
+def max_bipartite_matching(adjacency, match=None):
+    """Hopcroft-Karp maximum matching of adjacency {left: [right]}, augmenting match if given."""
+    match_left = dict(match or {})
+    match_right = {right: left for left, right in match_left.items()}
+    infinity = float("inf")
+
+    while True:
+        # BFS from the free left nodes, layering the graph by augmenting-path length
+        distance = {}
+        queue = []
+        for left in adjacency:
+            if left not in match_left:
+                distance[left] = 0
+                queue.append(left)
+        found = False
+        for left in queue:
+            for right in adjacency[left]:
+                partner = match_right.get(right)
+                if partner is None:
+                    found = True
+                elif partner not in distance:
+                    distance[partner] = distance[left] + 1
+                    queue.append(partner)
+        if not found:
+            return match_left
+
+        # DFS along the layers for vertex-disjoint shortest augmenting paths
+        for start in [left for left in adjacency if left not in match_left]:
+            path = []
+            stack = [(start, iter(adjacency[start]))]
+            while stack:
+                left, rights = stack[-1]
+                advanced = False
+                for right in rights:
+                    partner = match_right.get(right)
+                    if partner is None:
+                        path.append((left, right))
+                        for l, r in path:
+                            match_left[l] = r
+                            match_right[r] = l
+                        stack = []
+                        advanced = True
+                        break
+                    if distance.get(partner) == distance[left] + 1:
+                        path.append((left, right))
+                        stack.append((partner, iter(adjacency[partner])))
+                        advanced = True
+                        break
+                if not advanced:
+                    distance[left] = infinity  # dead end, don't revisit this phase
+                    stack.pop()
+                    if path:
+                        path.pop()
+
+
+def optimal_combo_pass(events, index, lanes, aggressiveness):
+    """combo_pass with the combos chosen by a maximum matching, seeded with the greedy ones."""
+    greedy_pairs, greedy_rows = combo_pass(events, index, lanes, aggressiveness)
+
+    # Every combo saves exactly one heat, so the most heats saved is a maximum matching
+    adjacency = {}
+    for female, male in greedy_pairs:
+        adjacency.setdefault(female, []).append(male)
+
+    seed = {}
+    for k, (i, can_combine, _, _) in enumerate(greedy_rows):
+        if can_combine == "Yes":
+            seed[i] = greedy_rows[k + 1][0]
+
+    matching = max_bipartite_matching(adjacency, seed)
+    partner_of = {male: female for female, male in matching.items()}
+
+    rows = []
+    for i, event in enumerate(events):
+        if i in partner_of:
+            continue  # listed under its female event
+        if event.gender not in FEMALE_GENDERS:
+            rows.append((i, "", "", False))
+            continue
+
+        if i in matching:
+            male = matching[i]
+            rows.append((i, "Yes", f"{event.entries % lanes} swimmers", False))
+            rows.append((male, "", f"{events[male].entries % lanes} swimmers", True))
+            continue
+
+        positions = index.get(event_key(event), [])
+        later = [position for position in positions[bisect_right(positions, i):] if position not in partner_of]
+        if not positions[bisect_right(positions, i):]:
+            rows.append((i, "No", "No male counterpart", False))
+        elif not later:
+            rows.append((i, "No", "Male counterpart already combined", False))
+        else:
+            reason = combo_reason(event.entries, events[later[0]].entries, lanes, aggressiveness)
+            rows.append((i, "No", reason, False))
+
+    pairs = sorted(matching.items())
+    return pairs, rows
+
+
+def evaluate_combos(events, lanes=6, aggressiveness=1, optimize=False):
+    """
+    Returns (pairs, table): the compatible pairs for the exports and every event with
+    "Can Combine?" / "Reason".  With optimize=True pairs lists only the chosen combos.
+    """
+    combo_solver = optimal_combo_pass if optimize else combo_pass
+    pair_positions, rows = combo_solver(events, build_male_index(events), lanes, aggressiveness)
+    pairs = [make_pair(events[female], events[male], lanes) for female, male in pair_positions]
+    table = [ComboRow(events[i], can_combine, reason, is_partner) for i, can_combine, reason, is_partner in rows]
+    return pairs, table
+
+
+# The configurations the combo page can switch between without a round trip
+LANE_OPTIONS = list(range(4, 11))
+AGGRESSIVENESS_OPTIONS = [1, 2, 3]
+
+# Reasons in the order evaluate_combos checks them
+SWEEP_REASONS = [
+    "One event has 0 entries",
+    "One event fills all lanes",
+    "Too many remainder swimmers",
+    "Combo strategy too conservative",
+]
+
+
+def sweep_combos(events, lane_options=LANE_OPTIONS, aggressiveness_options=AGGRESSIVENESS_OPTIONS, optimize=False):
+    """
+    evaluate_combos for every lanes x strategy configuration, with events as indexes:
+    {"lanes", "aggressiveness", "configs": {"6-1": {"combo_count", "pairs", "combos", "rows"}}}.
+    """
+    if optimize:
+        index = build_male_index(events)
+        configs = {}
+        for lane_count in lane_options:
+            for level in aggressiveness_options:
+                pairs, rows = optimal_combo_pass(events, index, lane_count, level)
+                configs[f"{lane_count}-{level}"] = {
+                    "combo_count": len(pairs),
+                    "pairs": [list(pair) for pair in pairs],
+                    "combos": [list(pair) for pair in pairs],
+                    "rows": [list(row) for row in rows],
+                }
+        return {"lanes": list(lane_options), "aggressiveness": list(aggressiveness_options), "configs": configs}
+
+    # The candidate pairs don't depend on the configuration, so they're found once
+    # and every configuration is checked in one set of array operations
+    entries = np.array([event.entries for event in events], dtype=np.int64)
+    lanes = np.array(lane_options, dtype=np.int64)[:, None, None]
+    aggressiveness = np.array(aggressiveness_options, dtype=np.int64)[None, :, None]
+
+    index = build_male_index(events)
+    pair_female, pair_male = [], []
+    greedy_female, greedy_male = [], []
+
+    for i, event in enumerate(events):
+        if event.gender not in FEMALE_GENDERS:
+            continue
+        positions = index.get(event_key(event), [])
+        later = positions[bisect_right(positions, i):]
+        if later:
+            greedy_female.append(i)
+            greedy_male.append(later[0])
+        if event.entries >= 1:
+            for position in later:
+                if events[position].entries >= 1:
+                    pair_female.append(i)
+                    pair_male.append(position)
+
+    # Every compatible pair, for every configuration at once
+    pair_female = np.array(pair_female, dtype=np.int64)
+    pair_male = np.array(pair_male, dtype=np.int64)
+    r1 = entries[pair_female][None, None, :] % lanes
+    r2 = entries[pair_male][None, None, :] % lanes
+    pair_ok = (r1 > 0) & (r2 > 0) & (r1 + r2 <= lanes) & (r1 >= aggressiveness) & (r2 >= aggressiveness)
+
+    # The greedy table only depends on the configuration, not on earlier picks,
+    # when no two female events reach for the same male event and male event
+    # numbers are unique.  Otherwise fall back to evaluating each configuration.
+    male_numbers = [event.number for event in events if event.gender in MALE_GENDERS]
+    independent = (len(set(greedy_male)) == len(greedy_male)
+                   and len(set(male_numbers)) == len(male_numbers))
+
+    if independent:
+        greedy_female = np.array(greedy_female, dtype=np.int64)
+        greedy_male = np.array(greedy_male, dtype=np.int64)
+        female_entries = entries[greedy_female][None, None, :]
+        male_entries = entries[greedy_male][None, None, :]
+        g1 = female_entries % lanes
+        g2 = male_entries % lanes
+        # 0-3 index SWEEP_REASONS, 4 means the pair combines
+        status = np.select(
+            [(female_entries < 1) | (male_entries < 1),
+             (g1 == 0) | (g2 == 0),
+             g1 + g2 > lanes,
+             (g1 < aggressiveness) | (g2 < aggressiveness)],
+            [0, 1, 2, 3],
+            default=4
+        )
+
+    configs = {}
+    for li, lane_count in enumerate(lane_options):
+        for ai, level in enumerate(aggressiveness_options):
+            pairs = np.flatnonzero(pair_ok[li, ai])
+            config = {
+                "combo_count": int(len(pairs)),
+                "pairs": [[int(pair_female[p]), int(pair_male[p])] for p in pairs],
+            }
+
+            if independent:
+                combined = status[li, ai] == 4
+                config["combos"] = np.stack([greedy_female[combined], greedy_male[combined]], axis=1).tolist()
+                config["rows"] = sweep_table_rows(events, lane_count, greedy_female, greedy_male, status[li, ai])
+            else:
+                _, rows = combo_pass(events, index, lane_count, level)
+                config["combos"] = chosen_combos(rows)
+                config["rows"] = [list(row) for row in rows]
+
+            configs[f"{lane_count}-{level}"] = config
+
+    return {
+        "lanes": list(lane_options),
+        "aggressiveness": list(aggressiveness_options),
+        "configs": configs,
+    }
+
+
+def chosen_combos(rows):
+    """(female, male) positions of the combined rows of a combo table."""
+    return [[row[0], rows[k + 1][0]] for k, row in enumerate(rows) if row[1] == "Yes"]
+
+
+def sweep_table_rows(events, lanes, greedy_female, greedy_male, status):
+    combined = status == 4
+    # A combined male row moves up to sit right under its female row
+    sort_position = np.arange(len(events), dtype=np.float64)
+    sort_position[greedy_male[combined]] = greedy_female[combined] + 0.5
+
+    female_status = dict(zip(greedy_female.tolist(), status.tolist()))
+    partner_males = set(greedy_male[combined].tolist())
+
+    rows = []
+    for i in np.argsort(sort_position, kind="stable").tolist():
+        event = events[i]
+        if i in partner_males:
+            rows.append([i, "", f"{event.entries % lanes} swimmers", True])
+        elif event.gender not in FEMALE_GENDERS:
+            rows.append([i, "", "", False])
+        elif i not in female_status:
+            rows.append([i, "No", "No male counterpart", False])
+        elif female_status[i] == 4:
+            rows.append([i, "Yes", f"{event.entries % lanes} swimmers", False])
+        else:
+            rows.append([i, "No", SWEEP_REASONS[female_status[i]], False])
+    return rows
+
@@ -0,0 +1,364 @@
+import os
+import re
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+import pytesseract
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image
+
+from cache_utils import DiskCache
+
+# Number of processes used to OCR pages concurrently, per gunicorn worker.  1
+# disables the pool.  Kept small rather than os.cpu_count(), which on a dyno is
+# the host's cores, not the dyno's share, and every process loads its own copy
+# of the OCR and imaging libraries.
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", 2))
+
+# Most pages a single request may have queued on the pool at once, so one big
+# upload can't starve the other requests sharing this gunicorn worker's pool:
+# their pages wait behind at most this many, not the whole report.
+OCR_MAX_PAGES_PER_REQUEST = int(os.environ.get("OCR_MAX_PAGES_PER_REQUEST", 2))
+
+OCR_CONFIG = "--psm 6"
+OCR_DPI = 300
+
+# "adaptive" OCRs a binarized, deskewed crop of the page at OCR_FAST_DPI and only
+# re-renders at OCR_DPI when too few event rows parse (see needs_full_dpi);
+# "full" OCRs the whole page at OCR_DPI like the original code did.
+OCR_MODE = os.environ.get("OCR_MODE", "adaptive")
+OCR_FAST_DPI = int(os.environ.get("OCR_FAST_DPI", 200))
+OCR_MIN_MATCH_RATE = float(os.environ.get("OCR_MIN_MATCH_RATE", 0.9))
+
+# How pages are rendered for OCR, see RASTERIZERS.  "pdfium" renders in-process
+# (pypdfium2 comes with pdfplumber); "poppler" shells out to pdftoppm.
+PDF_RASTERIZER = os.environ.get("PDF_RASTERIZER", "pdfium")
+
+# Which OCR engine to use, see OCR_BACKENDS.  "tesserocr" needs the optional
+# tesserocr package (pip install tesserocr), built against the system tesseract.
+OCR_BACKEND = os.environ.get("OCR_BACKEND", "pytesseract")
+
+# OCR text is cached per rendered page, so re-uploads and identical cover/break
+# pages across reports aren't OCR'd again
+OCR_CACHE_MAX_BYTES = int(os.environ.get("OCR_CACHE_MAX_BYTES", 20 * 1024 * 1024))
+OCR_CACHE_MAX_AGE = int(os.environ.get("OCR_CACHE_MAX_AGE", 30 * 24 * 60 * 60))
+
+OCR_EVENT_PATTERN = re.compile(
+    r"^(\d+)\s+"                             # Event number
+    r"(Mixed|Girls|Boys|Women|Men)\s+"       # Gender
+    r"([\d&\s\-Uunder]+)\s+"                 # Age group (e.g. 6 & Under, 9-10, etc.)
+    r"(\d{2,4}yd)\s+"                        # Distance (e.g. 100yd)
+    r"([\w\s]+?)\s+"                         # Stroke (e.g. Freestyle Relay)
+    r"(\d+)\s+"                              # Entries
+    r"(\d+)\s+"                              # Heats
+    r"(\d{1,2}:\d{2}(?:\s*[AP]M)?)"       # Est. Start (OCR may drop the AM/PM)
+)
+
+OCR_EVENT_LINE_START = re.compile(r"^\d+\s+(Mixed|Girls|Boys|Women|Men)\b")
+
+_executor = None
+_backend = None
+_rasterizer = None
+_ocr_cache = None
+
+
+class PdfiumRasterizer:
+    """Renders pages in-process straight to grayscale images in memory."""
+    name = "pdfium"
+
+    def __init__(self):
+        import pypdfium2
+        self.pdfium = pypdfium2
+
+    def count_pages(self, pdf_path):
+        pdf = self.pdfium.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def render_page(self, pdf_path, page_number, dpi):
+        pdf = self.pdfium.PdfDocument(pdf_path)
+        try:
+            page = pdf[page_number - 1]
+            bitmap = page.render(scale=dpi / 72, grayscale=True)
+            # to_pil() shares the bitmap's buffer, so copy before it's released
+            image = bitmap.to_pil().convert("L")
+            bitmap.close()
+            page.close()
+            return image
+        finally:
+            pdf.close()
+
+
+class PopplerRasterizer:
+    """Renders pages with poppler's pdftoppm through pdf2image."""
+    name = "poppler"
+
+    def count_pages(self, pdf_path):
+        return pdfinfo_from_path(pdf_path)["Pages"]
+
+    def render_page(self, pdf_path, page_number, dpi):
+        images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=True)
+        return images[0]
+
+
+RASTERIZERS = {
+    "pdfium": PdfiumRasterizer,
+    "poppler": PopplerRasterizer,
+}
+
+
+def get_rasterizer():
+    global _rasterizer
+    if _rasterizer is None:
+        try:
+            _rasterizer = RASTERIZERS[PDF_RASTERIZER]()
+        except ImportError as e:
+            print(f"⚠️ PDF rasterizer '{PDF_RASTERIZER}' unavailable ({e}), using poppler")
+            _rasterizer = PopplerRasterizer()
+    return _rasterizer
+
+
+class PytesseractBackend:
+    """Runs the tesseract command line once per image (the original behavior)."""
+    name = "pytesseract"
+
+    def image_to_string(self, image):
+        return pytesseract.image_to_string(image, config=OCR_CONFIG)
+
+
+class TesserocrBackend:
+    """Keeps one tesseract engine loaded per process and passes it images in memory."""
+    name = "tesserocr"
+
+    def __init__(self):
+        import tesserocr
+        # PSM.SINGLE_BLOCK is the same page segmentation as --psm 6
+        self.api = tesserocr.PyTessBaseAPI(lang="eng", psm=tesserocr.PSM.SINGLE_BLOCK)
+
+    def image_to_string(self, image):
+        self.api.SetImage(image)
+        return self.api.GetUTF8Text()
+
+
+OCR_BACKENDS = {
+    "pytesseract": PytesseractBackend,
+    "tesserocr": TesserocrBackend,
+}
+
+
+def get_ocr_backend():
+    """One backend per process; pool workers create theirs when they start."""
+    global _backend
+    if _backend is None:
+        try:
+            _backend = OCR_BACKENDS[OCR_BACKEND]()
+        except (ImportError, RuntimeError) as e:
+            print(f"⚠️ OCR backend '{OCR_BACKEND}' unavailable ({e}), using pytesseract")
+            _backend = PytesseractBackend()
+    return _backend
+
+
+def get_ocr_executor():
+    """The pool is created on first use and reused for the life of the process."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=OCR_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=get_ocr_backend
+        )
+    return _executor
+
+
+def count_pages(pdf_path):
+    return get_rasterizer().count_pages(pdf_path)
+
+
+def render_page(pdf_path, page_number, dpi=OCR_DPI):
+    """Render a single page to a grayscale image in memory."""
+    return get_rasterizer().render_page(pdf_path, page_number, dpi)
+
+
+def needs_full_dpi(text):
+    """Whether a page OCR'd at OCR_FAST_DPI should be OCR'd again at OCR_DPI."""
+    lines = [line.strip() for line in text.splitlines()]
+    candidates = [line for line in lines if OCR_EVENT_LINE_START.match(line)]
+    if candidates:
+        matched = sum(1 for line in candidates if OCR_EVENT_PATTERN.match(line))
+        return matched / len(candidates) < OCR_MIN_MATCH_RATE
+    # No event rows: blank pages and pages with the header (cover, break,
+    # trailer) keep the fast text, anything else may have been misread whole
+    has_header = any(line.startswith("Session Report") and "Page" in line for line in lines)
+    return any(lines) and not has_header
+
+
+def otsu_threshold(image):
+    histogram = image.histogram()[:256]
+    total = sum(histogram)
+    sum_all = sum(i * count for i, count in enumerate(histogram))
+    sum_background = weight_background = 0
+    best_threshold, best_variance = 127, 0.0
+
+    for i, count in enumerate(histogram):
+        weight_background += count
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+        sum_background += i * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_threshold, best_variance = i, variance
+
+    return best_threshold
+
+
+def estimate_skew(binary, max_angle=2.0, step=0.25):
+    """
+    Angle (degrees) that makes the text rows most sharply defined, judged on a
+    small copy of the page by the variance of the row ink profile.
+    """
+    scale = min(1.0, 800 / max(binary.size))
+    thumb = binary.resize((max(1, int(binary.width * scale)), max(1, int(binary.height * scale))))
+
+    best_angle, best_score = 0.0, -1.0
+    angle = -max_angle
+    while angle <= max_angle + 1e-9:
+        rotated = thumb.rotate(angle, resample=Image.NEAREST, fillcolor=255)
+        ink = (np.asarray(rotated) < 128).sum(axis=1)
+        score = float(np.var(ink))
+        if score > best_score:
+            best_angle, best_score = angle, score
+        angle += step
+
+    return best_angle
+
+
+def find_table_region(binary):
+    """Bounding box of the page content without the margins, keeping the header and any footer band."""
+    ink = np.asarray(binary) < 128
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if not len(rows):
+        return None
+
+    top, bottom = int(rows[0]), int(rows[-1])
+
+    # Drop a short footer band separated from the body by a wide gap
+    wide_gaps = np.flatnonzero(np.diff(rows) > binary.height * 0.04)
+    if len(wide_gaps):
+        last_gap = wide_gaps[-1]
+        if bottom - rows[last_gap + 1] < binary.height * 0.06:
+            bottom = int(rows[last_gap])
+
+    pad = 10
+    return (
+        max(int(cols[0]) - pad, 0),
+        max(top - pad, 0),
+        min(int(cols[-1]) + pad + 1, binary.width),
+        min(bottom + pad + 1, binary.height),
+    )
+
+
+def prepare_for_ocr(image):
+    """Binarize, deskew and crop a grayscale page.  The input image is closed."""
+    threshold = otsu_threshold(image)
+    binary = image.point(lambda p: 255 if p > threshold else 0)
+    image.close()
+
+    angle = estimate_skew(binary)
+    if angle:
+        deskewed = binary.rotate(angle, resample=Image.NEAREST, fillcolor=255)
+        binary.close()
+        binary = deskewed
+
+    region = find_table_region(binary)
+    if region:
+        cropped = binary.crop(region)
+        binary.close()
+        binary = cropped
+
+    return binary
+
+
+def get_ocr_cache():
+    global _ocr_cache
+    if _ocr_cache is None:
+        _ocr_cache = DiskCache("ocr_pages", OCR_CACHE_MAX_BYTES, max_age=OCR_CACHE_MAX_AGE, suffix=".txt")
+    return _ocr_cache
+
+
+def ocr_cache_key(image):
+    """Hash of the rendered page pixels plus every setting that changes the OCR text."""
+    settings = f"{OCR_MODE}|{OCR_CONFIG}|{OCR_FAST_DPI}|{OCR_DPI}|{OCR_MIN_MATCH_RATE}|{get_ocr_backend().name}"
+    digest = hashlib.sha256(settings.encode("utf-8"))
+    digest.update(f"{image.mode}|{image.size}".encode("utf-8"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def ocr_pdf_page(task):
+    """Render and OCR one page; task is (pdf_path, page_number, debug_image_path)."""
+    pdf_path, page_number, debug_image_path = task
+    if OCR_MODE == "full" or OCR_FAST_DPI >= OCR_DPI:
+        dpis = [OCR_DPI]
+    else:
+        dpis = [OCR_FAST_DPI, OCR_DPI]
+
+    cache_key = None
+
+    for dpi in dpis:
+        image = render_page(pdf_path, page_number, dpi)
+        try:
+            if cache_key is None:
+                cache_key = ocr_cache_key(image)
+                cached = get_ocr_cache().get(cache_key)
+                if cached is not None:
+                    if debug_image_path:
+                        image.save(debug_image_path, "PNG")
+                    return cached.decode("utf-8")
+
+            if OCR_MODE != "full":
+                image = prepare_for_ocr(image)
+            if debug_image_path:
+                image.save(debug_image_path, "PNG")
+            text = get_ocr_backend().image_to_string(image)
+        finally:
+            image.close()
+
+        if dpi == dpis[-1] or not needs_full_dpi(text):
+            get_ocr_cache().set(cache_key, text.encode("utf-8"))
+            return text
+
+
+def map_pages(func, items):
+    """
+    Run func over items on the OCR pool and return the results in input order,
+    keeping at most OCR_MAX_PAGES_PER_REQUEST items in flight.
+    """
+    items = list(items)
+    if OCR_WORKERS <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    executor = get_ocr_executor()
+    results = [None] * len(items)
+    pending = {}
+
+    for index, item in enumerate(items):
+        if len(pending) >= max(1, OCR_MAX_PAGES_PER_REQUEST):
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+        pending[executor.submit(func, item)] = index
+
+    for future, index in pending.items():
+        results[index] = future.result()
+
+    return results
@@ -4,195 +4,310 @@ import unicodedata
 import pandas as pd
 import re
 import os
-import pytesseract
-from pdf2image import convert_from_path
-from tempfile import TemporaryDirectory
-from PIL import Image, ImageOps
+import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from fpdf import FPDF
 from fpdf.enums import XPos, YPos
 from weasyprint import HTML
 
-from parse_bad_pdf import sanitize_for_pdf
+from ocr_utils import map_pages, ocr_pdf_page, count_pages, OCR_EVENT_PATTERN
+from cache_utils import DiskCache, file_digest
+from combo_engine import evaluate_combos
+from session_timeline import normalize_start_time
+from session_event import SessionEvent
+
+# Bump whenever the parsers change what they return, so stale cache entries are ignored
+PARSE_CACHE_VERSION = 5
+PARSE_CACHE_MAX_BYTES = int(os.environ.get("PARSE_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+
+_parse_cache = None
 
 
 def extract_events_from_pdf(pdf_path):
-    events = []
-    meet_title = "Meet Title"
+    """
+    Parse a Meet Maestro session report from its text layer, OCR'ing only the pages
+    that have no event rows in it.
+    """
+    page_events, ocr_pages, meet_title = parse_text_layer(pdf_path)
+    if not ocr_pages:
+        return merge_page_events(page_events, meet_title)
+    return merge_page_events(page_events, meet_title, *extract_events_by_page_with_ocr(pdf_path, ocr_pages, meet_title))
+
+def parse_text_layer(pdf_path):
+    """The text half of extract_events_from_pdf.  Returns (page_events, ocr_pages, meet_title)."""
+    meet_title = None
+    columns = None
+
+    page_events = {}
+    ocr_pages = []
+    readable_pages = set()
 
     with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages):
-            lines = page.extract_text().split('\n')
-
-            for line_num, line in enumerate(lines):
-                if "Session Report" in line and "Page" in line:
-                    try:
-                        start = line.index("Session Report") + len("Session Report")
-                        end = line.index("Page")
-                        meet_title = line[start:end].strip(" —-")
-                        meet_title = meet_title.replace("—", "-")
-                    except:
-                        pass
-
-                match = re.match(r'^(\d+)\s+(Mixed|Girls|Boys|Women|Men)\s+(.+?)\s+(\d+)\s+(\d+)\s+(\d{1,2}:\d{2}\s*[AP]M)$', line.strip())
-                if not match:
-                    continue
-
-                number = int(match.group(1))
-                gender = match.group(2)
-                rest = match.group(3).strip()
-                entries = int(match.group(4))
-                heats = int(match.group(5))
-
-                if rest.startswith("6"):
-                    age_group = rest[:9]
-                    remainder = rest[9:]
-                elif rest.startswith("7"):
-                    age_group = rest[:3]
-                    remainder = rest[3:]
-                elif rest.startswith("9"):
-                    age_group = rest[:4]
-                    remainder = rest[4:]
-                elif rest.startswith("1"):
-                    age_group = rest[:5]
-                    remainder = rest[5:]
-                else:
-                    continue
+        page_count = len(pdf.pages)
 
-                distance_match = re.match(r'^(\d{2,3}yd)(.+)$', remainder)
-                if not distance_match:
-                    continue
+        started = time.perf_counter()
+        first_page_lines = (pdf.pages[0].extract_text() or "").split('\n') if page_count else []
+        sample_seconds = time.perf_counter() - started
 
-                distance = distance_match.group(1)
-                stroke = distance_match.group(2).strip()
+        producer = pdf_producer(pdf.metadata)
+        route = classify_pdf(producer, first_page_lines)
 
-                events.append({
-                    "Event #": number,
-                    "Gender": gender,
-                    "Age Group": age_group,
-                    "Distance": distance,
-                    "Stroke": stroke,
-                    "Entries": entries,
-                    "Heats": heats
-                })
-
-    if not events:
-        events, meet_title = extract_events_from_bad_pdf(pdf_path)
-    if not events:
-        events, meet_title = extract_events_from_microsoft_pdf(pdf_path)
+        if route == "ocr":
+            ocr_pages = list(range(1, page_count + 1))
+        else:
+            for page_number, page in enumerate(pdf.pages, start=1):
+                if page_number == 1:
+                    lines = first_page_lines
+                else:
+                    lines = (page.extract_text() or "").split('\n')
+
+                title = find_meet_title(lines)
+                if title:
+                    meet_title = title
+                    readable_pages.add(page_number)
+
+                events = parse_text_events(lines)
+
+                # The line regex silently drops rows it can't slice (unusual age
+                # groups, glued columns), so fall back to word positions for them
+                if len(events) < count_event_lines(lines):
+                    words = page.extract_words()
+                    if columns is None:
+                        columns = find_table_columns(words)
+                    if columns:
+                        column_events = parse_column_events(words, columns)
+                        if len(column_events) > len(events):
+                            events = column_events
+
+                if not events:
+                    events = parse_token_events(lines)
+
+                if events:
+                    page_events[page_number] = events
+                else:
+                    ocr_pages.append(page_number)
 
+    if route == "ocr":
+        # Estimated from the first page: the text passes we didn't run on the rest
+        saved_seconds = sample_seconds * max(page_count - 1, 0)
+        print(f"🧭 {os.path.basename(pdf_path)} ({producer or 'unknown producer'}): OCR route, "
+              f"skipped ~{saved_seconds:.2f}s of text extraction on {max(page_count - 1, 0)} pages")
+    else:
+        print(f"🧭 {os.path.basename(pdf_path)} ({producer or 'unknown producer'}): text route")
 
-    return events, meet_title
+    # A page with a readable header but no events (e.g. a trailing page) is
+    # left alone, unless the text layer produced nothing usable at all.
+    if page_events:
+        ocr_pages = [page_number for page_number in ocr_pages if page_number not in readable_pages]
 
-def find_combinable_pairs(events, lanes=6, aggressiveness=1):
-    pairs = []
-    for i, e1 in enumerate(events):
-        if e1["Gender"] not in ("Girls", "Women") or e1["Entries"] < 1:
-            continue
+    return page_events, ocr_pages, meet_title
 
-        for e2 in events[i + 1:]:
-            if e2["Gender"] not in ("Boys", "Men") or e2["Entries"] < 1:
-                continue
-
-            if (
-                e1["Age Group"] == e2["Age Group"]
-                and e1["Distance"] == e2["Distance"]
-                and e1["Stroke"] == e2["Stroke"]
-            ):
-                r1 = e1["Entries"] % lanes
-                r2 = e2["Entries"] % lanes
-
-                if r1 == 0 or r2 == 0:
-                    continue
-                if r1 + r2 > lanes:
-                    continue
-                if r1 < aggressiveness or r2 < aggressiveness:
-                    continue
-
-                pairs.append({
-                    "Female Event #": e1["Event #"],
-                    "Female Age": f"{e1['Gender']} {e1['Age Group']}",
-                    "Female Heat #": e1["Heats"],
-                    "Female # Swimmers": r1,
-                    "combine with": "combine with",
-                    "Male Event #": e2["Event #"],
-                    "Male Age": f"{e2['Gender']} {e2['Age Group']}",
-                    "Male Heat #": 1,
-                    "Male # Swimmers": r2,
-                    "Distance": e1["Distance"],
-                    "Stroke": e1["Stroke"]
-                })
+def merge_page_events(page_events, meet_title, ocr_events=None, ocr_title="Unknown Meet"):
+    """Combine the text and OCR halves of a parse into (events, meet_title)."""
+    page_events = {**page_events, **(ocr_events or {})}
+    if not meet_title and ocr_title != "Unknown Meet":
+        meet_title = ocr_title
 
-    return pairs
+    events = [event for page_number in sorted(page_events) for event in page_events[page_number]]
 
-def evaluate_all_events(events, lanes, aggressiveness):
-    result = []
-    used_male_ids = set()
+    if not meet_title:
+        meet_title = "Meet Title" if events else "Unknown Meet"
 
-    for i, e1 in enumerate(events):
-        if e1["Gender"] in ("Boys", "Men") and e1["Event #"] in used_male_ids:
-            continue  # already paired and added
+    return events, meet_title
 
-        row = e1.copy()
+# Generators known to write a real text layer: Chrome and Edge (Skia), Firefox
+# (cairo) and macOS (Quartz)
+TEXT_PDF_PRODUCERS = ("skia", "cairo", "quartz", "mozilla", "firefox", "chrome")
+
+# "Microsoft Print to PDF" never produces text rows and always ends up in OCR
+OCR_PDF_PRODUCERS = ("microsoft: print to pdf", "microsoft print to pdf")
+
+def pdf_producer(metadata):
+    parts = [str(metadata.get(key, "")).strip() for key in ("Producer", "Creator")]
+    return " / ".join(part for part in parts if part)
+
+def classify_pdf(producer, first_page_lines):
+    """
+    Pick a parse route without touching more than the first page: "ocr" for
+    reports whose text layer is known to be useless, "text" otherwise.
+    """
+    if count_event_lines(first_page_lines):
+        return "text"
+
+    producer = producer.lower()
+    if any(name in producer for name in TEXT_PDF_PRODUCERS):
+        return "text"
+    if any(name in producer for name in OCR_PDF_PRODUCERS):
+        return "ocr"
+
+    # Unknown producer: a first page with no readable text at all won't parse
+    if not "".join(first_page_lines).strip():
+        return "ocr"
+    return "text"
+
+def get_parse_cache():
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = DiskCache("parsed_reports", PARSE_CACHE_MAX_BYTES)
+    return _parse_cache
+
+def read_parse_cache(digest):
+    """(events, meet_title) cached for a report digest, or None."""
+    cached = get_parse_cache().get_json(f"{digest}-v{PARSE_CACHE_VERSION}")
+    if cached is None:
+        return None
+    return [SessionEvent.from_dict(row) for row in cached["events"]], cached["meet_title"]
+
+def write_parse_cache(digest, events, meet_title):
+    get_parse_cache().set_json(f"{digest}-v{PARSE_CACHE_VERSION}", {
+        "events": [event.to_dict() for event in events],
+        "meet_title": meet_title
+    })
+
+def extract_events_from_pdf_cached(pdf_path, digest=None):
+    """extract_events_from_pdf, cached by the SHA-256 of the PDF (pass digest if it's already known)."""
+    digest = digest or file_digest(pdf_path)
+
+    cached = read_parse_cache(digest)
+    if cached is not None:
+        print(f"🗂️ Parse cache hit for {os.path.basename(pdf_path)} ({digest[:12]})")
+        return cached
+
+    print(f"🗂️ Parse cache miss for {os.path.basename(pdf_path)} ({digest[:12]})")
+    events, meet_title = extract_events_from_pdf(pdf_path)
+
+    # Don't cache a failed parse; a re-upload should get another try
+    if events:
+        write_parse_cache(digest, events, meet_title)
 
-        # Only female events initiate a combo
-        if e1["Gender"] not in ("Girls", "Women"):
-            row["Can Combine?"] = ""
-            row["Reason"] = ""
-            result.append(row)
-            continue
+    return events, meet_title
 
-        matching = next(
-            (e2 for e2 in events[i + 1:]
-             if e2["Gender"] in ("Boys", "Men")
-             and e2["Age Group"] == e1["Age Group"]
-             and e2["Distance"] == e1["Distance"]
-             and e2["Stroke"] == e1["Stroke"]
-             and e2["Event #"] not in used_male_ids),
-            None
-        )
+def extract_events_from_pdfs_cached(pdf_paths):
+    """
+    extract_events_from_pdf_cached for several reports at once.  Returns
+    [(events, meet_title, digest)] in the order given.
+    """
+    digests = [file_digest(pdf_path) for pdf_path in pdf_paths]
+    results = [None] * len(pdf_paths)
+    misses = []
+
+    for i, (pdf_path, digest) in enumerate(zip(pdf_paths, digests)):
+        cached = read_parse_cache(digest)
+        if cached is not None:
+            print(f"🗂️ Parse cache hit for {os.path.basename(pdf_path)} ({digest[:12]})")
+            results[i] = (*cached, digest)
+        else:
+            print(f"🗂️ Parse cache miss for {os.path.basename(pdf_path)} ({digest[:12]})")
+            misses.append(i)
+
+    # Text layers go through the OCR pool like pages, so at most
+    # OCR_MAX_PAGES_PER_REQUEST reports (and OCR_WORKERS at a time) are read at
+    # once; the OCR'd pages of every report then share one map_pages call
+    text_layers = map_pages(parse_text_layer, [pdf_paths[i] for i in misses])
+    ocr_results = iter(ocr_page_events([
+        (pdf_paths[i], ocr_pages, meet_title) for i, (_, ocr_pages, meet_title) in zip(misses, text_layers) if ocr_pages
+    ]))
+
+    for i, (page_events, ocr_pages, meet_title) in zip(misses, text_layers):
+        if ocr_pages:
+            events, meet_title = merge_page_events(page_events, meet_title, *next(ocr_results))
+        else:
+            events, meet_title = merge_page_events(page_events, meet_title)
+
+        if events:
+            write_parse_cache(digests[i], events, meet_title)
+        results[i] = (events, meet_title, digests[i])
+
+    return results
+
+def load_cached_events(digest):
+    """(events, meet_title) for a report parsed earlier, or None if it isn't cached."""
+    if not re.fullmatch(r"[0-9a-f]{64}", digest or ""):
+        return None
+    return read_parse_cache(digest)
+
+def find_meet_title(lines):
+    meet_title = None
+    for line in lines:
+        if "Session Report" in line and "Page" in line:
+            try:
+                start = line.index("Session Report") + len("Session Report")
+                end = line.index("Page")
+                meet_title = line[start:end].strip(" —-")
+                meet_title = meet_title.replace("—", "-")
+            except:
+                pass
+    return meet_title
+
+def parse_text_events(lines):
+    events = []
 
-        if not matching:
-            row["Can Combine?"] = "No"
-            row["Reason"] = "No male counterpart"
-            result.append(row)
+    for line in lines:
+        match = re.match(r'^(\d+)\s+(Mixed|Girls|Boys|Women|Men)\s+(.+?)\s+(\d+)\s+(\d+)\s+(\d{1,2}:\d{2}\s*[AP]M)$', line.strip())
+        if not match:
             continue
 
-        r1 = e1["Entries"] % lanes
-        r2 = matching["Entries"] % lanes
-
-        if e1["Entries"] < 1 or matching["Entries"] < 1:
-            row["Can Combine?"] = "No"
-            row["Reason"] = "One event has 0 entries"
-        elif r1 == 0 or r2 == 0:
-            row["Can Combine?"] = "No"
-            row["Reason"] = "One event fills all lanes"
-        elif r1 + r2 > lanes:
-            row["Can Combine?"] = "No"
-            row["Reason"] = "Too many remainder swimmers"
-        elif r1 < aggressiveness or r2 < aggressiveness:
-            row["Can Combine?"] = "No"
-            row["Reason"] = "Combo strategy too conservative"
+        number = int(match.group(1))
+        gender = match.group(2)
+        rest = match.group(3).strip()
+        entries = int(match.group(4))
+        heats = int(match.group(5))
+        start_time = normalize_start_time(match.group(6))
+
+        if rest.startswith("6"):
+            age_group = rest[:9]
+            remainder = rest[9:]
+        elif rest.startswith("7"):
+            age_group = rest[:3]
+            remainder = rest[3:]
+        elif rest.startswith("9"):
+            age_group = rest[:4]
+            remainder = rest[4:]
+        elif rest.startswith("1"):
+            age_group = rest[:5]
+            remainder = rest[5:]
         else:
-            row["Can Combine?"] = "Yes"
-            row["Reason"] = f"{r1} swimmers"
-            used_male_ids.add(matching["Event #"])
-
-            # Append female row first
-            result.append(row)
-
-            # Now insert a silent highlight flag in male row (not shown in table)
-            male_row = matching.copy()
-            male_row["Can Combine?"] = ""
-            male_row["Reason"] = f"{r2} swimmers"
-            male_row["_highlight_partner"] = True  # internal only
-            result.append(male_row)
             continue
 
-        result.append(row)
+        distance_match = re.match(r'^(\d{2,3}yd)(.+)$', remainder)
+        if not distance_match:
+            continue
+
+        distance = distance_match.group(1)
+        stroke = distance_match.group(2).strip()
+
+        events.append(SessionEvent(number, gender, age_group, distance, stroke, entries, heats, start_time))
+
+    return events
+
+def combo_batch(pdf_paths, lanes=6, aggressiveness=1, optimize=False):
+    """
+    Parse several session reports of a meet together and find the combos of each.
+    Returns (sessions, pairs, meet_title).
+    """
+    sessions = []
+    for pdf_path, (events, meet_title, digest) in zip(pdf_paths, extract_events_from_pdfs_cached(pdf_paths)):
+        pairs, table = evaluate_combos(events, lanes, aggressiveness, optimize)
+        sessions.append({
+            "file": os.path.basename(pdf_path),
+            "digest": digest,
+            "meet_title": meet_title,
+            "pairs": pairs,
+            "table": table
+        })
+
+    titles = list(dict.fromkeys(session["meet_title"] for session in sessions))
+    pairs = [pair for session in sessions for pair in session["pairs"]]
+    return sessions, pairs, " / ".join(titles) or "Unknown Meet"
+
+def find_combinable_pairs(events, lanes=6, aggressiveness=1):
+    pairs, _ = evaluate_combos(events, lanes, aggressiveness)
+    return pairs
 
-    return result
+def evaluate_all_events(events, lanes, aggressiveness):
+    _, table = evaluate_combos(events, lanes, aggressiveness)
+    return table
 
 def export_pairs_to_csv(pairs, csv_path, meet_title):
     if not pairs:
@@ -314,150 +429,215 @@ def export_pairs_to_pdf(pairs, pdf_path, meet_title):
     pdf.output(pdf_path)
     print(f"📄 Exported {len(pairs)} combinable pairs to '{pdf_path}'")
 
-def extract_events_from_bad_pdf(pdf_path):
+EVENT_LINE_START = re.compile(r"^\d+\s+(Mixed|Girls|Boys|Women|Men)\s")
+
+# The known distances let an age group glued to its distance ("11-1250yd") be
+# split without guessing at the age group's length
+EVENT_CELL_PATTERN = re.compile(
+    r"^(\d+)\s+"                                              # Event number
+    r"(Mixed|Girls|Boys|Women|Men)\s+"                        # Gender
+    r"(.+?)\s*"                                               # Age group
+    r"((?:25|50|100|200|400|500|800|1000|1500|1650)\s*(?:yd|m))\s*"  # Distance
+    r"(.+)$"                                                  # Stroke
+)
+START_TIME_PATTERN = re.compile(r"^\d{1,2}:\d{2}\s*[AP]M$")
+
+def count_event_lines(lines):
+    return sum(1 for line in lines if EVENT_LINE_START.match(line.strip()))
+
+def find_table_columns(words):
+    """
+    Find the Entries, Heats and Est. Start header words.  Returns the header
+    boxes as {column: (x0, x1)}, or None if this page has no header row.
+    """
+    headers = {}
+    for word in words:
+        if word["text"] == "Entries":
+            headers["Entries"] = word
+        elif word["text"] == "Heats":
+            headers["Heats"] = word
+        elif word["text"] == "Est.":
+            headers["Est. Start"] = word
+
+    if len(headers) < 3:
+        return None
+
+    # All three must sit on the same header row
+    tops = [word["top"] for word in headers.values()]
+    if max(tops) - min(tops) > 3:
+        return None
+
+    return {column: (word["x0"], word["x1"]) for column, word in headers.items()}
+
+def group_words_into_rows(words, tolerance=3):
+    rows = []
+    for word in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        if rows and abs(word["top"] - rows[-1][0]["top"]) <= tolerance:
+            rows[-1].append(word)
+        else:
+            rows.append([word])
+    return rows
+
+def parse_column_events(words, columns):
+    """Split each row of words into Event / Entries / Heats / Est. Start cells by x position."""
     events = []
-    meet_title = "Unknown Meet"
+    event_boundary = columns["Entries"][0] - 2
+    centers = {column: (x0 + x1) / 2 for column, (x0, x1) in columns.items()}
+
+    for row in group_words_into_rows(words):
+        cells = {"Event": [], "Entries": [], "Heats": [], "Est. Start": []}
+        for word in sorted(row, key=lambda w: w["x0"]):
+            if word["x0"] < event_boundary:
+                cells["Event"].append(word["text"])
+            else:
+                middle = (word["x0"] + word["x1"]) / 2
+                column = min(centers, key=lambda c: abs(centers[c] - middle))
+                cells[column].append(word["text"])
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
-                continue
-            lines = text.splitlines()
-
-            # Extract meet title
-            for line in lines:
-                if "Session Report" in line and "Page" in line:
-                    match = re.search(r"Session Report (.*?) Page", line)
-                    if match:
-                        meet_title = match.group(1).strip()
-                        meet_title = meet_title.replace("—", "-")
-
-            for line in lines:
-                # Skip lines that don't look like events
-                if not re.match(r"^\d+\s+(Mixed|Boys|Girls|Men|Women)\s", line):
-                    continue
-
-                # Split on whitespace but preserve stroke name
-                parts = line.strip().split()
-                if len(parts) < 8:
-                    continue  # skip malformed lines
-
-                # Extract fields
-                event_number = int(parts[0])
-                gender = parts[1]
-                age_group_parts = []
-                i = 2
-                # Capture age group until we find the yard/meter indicator
-                while not re.match(r"\d+(yd|m)", parts[i]):
-                    age_group_parts.append(parts[i])
-                    i += 1
-                age_group = " ".join(age_group_parts)
-
-                distance = re.match(r"(\d+)(yd|m)", parts[i]).group(0)
-                i += 1
-                stroke_parts = []
-                # Capture stroke name until we reach numbers (Entries, Heats, Time)
-                while i < len(parts) and not parts[i].isdigit():
-                    stroke_parts.append(parts[i])
-                    i += 1
-                stroke = " ".join(stroke_parts)
-
-                try:
-                    entries = int(parts[i])
-                    heats = int(parts[i + 1])
-                    start_time = parts[i + 2]
-                except (IndexError, ValueError):
-                    continue  # malformed row
-
-                events.append({
-                    "Event #": event_number,
-                    "Gender": gender,
-                    "Age Group": age_group,
-                    "Distance": distance,
-                    "Stroke": stroke,
-                    "Entries": entries,
-                    "Heats": heats,
-                })
+        match = EVENT_CELL_PATTERN.match(" ".join(cells["Event"]))
+        if not match:
+            continue
 
-    return events, meet_title
+        entries = " ".join(cells["Entries"])
+        heats = " ".join(cells["Heats"])
+        start_time = " ".join(cells["Est. Start"])
+        if not (entries.isdigit() and heats.isdigit() and START_TIME_PATTERN.match(start_time)):
+            continue
 
-def extract_events_from_microsoft_pdf(pdf_path):
+        events.append(SessionEvent(
+            int(match.group(1)),
+            match.group(2),
+            match.group(3).strip(),
+            match.group(4).replace(" ", ""),
+            match.group(5).strip(),
+            int(entries),
+            int(heats),
+            normalize_start_time(start_time)
+        ))
+
+    return events
+
+def parse_token_events(lines):
     events = []
-    meet_title = "Unknown Meet"
-    image_paths = []
-
-    with TemporaryDirectory() as temp_dir:
-        images = convert_from_path(pdf_path, dpi=300, output_folder=temp_dir, fmt="png")
-
-        for i, image in enumerate(images):
-            image_filename = os.path.join("static/generated", f"debug_page_{i+1}.png")
-            image.save(image_filename, "PNG")
-            image_paths.append(image_filename)
-
-            gray = ImageOps.grayscale(Image.open(image_filename))
-            text = pytesseract.image_to_string(gray, config="--psm 6")
-
-            print(f"\n--- OCR TEXT FROM {image_filename} ---\n{text}\n")
-
-            event_pattern = re.compile(
-                r"^(\d+)\s+"                             # Event number
-                r"(Mixed|Girls|Boys|Women|Men)\s+"       # Gender
-                r"([\d&\s\-Uunder]+)\s+"                 # Age group (e.g. 6 & Under, 9-10, etc.)
-                r"(\d{2,4}yd)\s+"                        # Distance (e.g. 100yd)
-                r"([\w\s]+?)\s+"                         # Stroke (e.g. Freestyle Relay)
-                r"(\d+)\s+"                              # Entries
-                r"(\d+)\s+"                              # Heats
-                r"\d{1,2}:\d{2}\s*(AM|PM)?"              # Time (optional match, ignored)
-            )
-
-            for line in text.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Try to extract meet title if not already found
-                if line.startswith("Session Report") and "Page" in line:
-                    try:
-                        parts = line.split("Page")[0]  # Get everything before "Page"
-                        title_part = parts.replace("Session Report", "").strip()
-                        meet_title = sanitize_for_pdf(title_part)
-                    except Exception as e:
-                        print(f"Failed to extract title from: {line}")
-
-                if meet_title == "Unknown Meet":
-                    continue
-
-                match = event_pattern.match(line)
-                if match:
-                    event_number = match.group(1)
-                    gender = match.group(2)
-                    age_group = match.group(3).strip()
-                    distance = match.group(4)
-                    stroke = match.group(5)
-                    entries = int(match.group(6))
-                    heats = int(match.group(7))
-
-                    #desc_match = re.match(r"^(\d+)\s+(Mixed|Girls|Boys|Women|Men)\s+(.+)\s+(\d+)\s+(\d+)\s+\d{1,2}:\d{2}", description, re.IGNORECASE)
-                    #if not desc_match:
-                    #    print(f"Could not parse title: '{description}'")
-                    #    continue
-
-                    #gender = desc_match.group(1).capitalize()
-                    #age_group = desc_match.group(2)
-                    #distance = desc_match.group(3)
-                    #stroke = desc_match.group(4).strip()
-
-                    events.append({
-                        "Event #": event_number,
-                        "Gender": gender,
-                        "Age Group": age_group,
-                        "Distance": distance,
-                        "Stroke": stroke,
-                        "Entries": entries,
-                        "Heats": heats,
-                    })
 
+    for line in lines:
+        # Skip lines that don't look like events
+        if not re.match(r"^\d+\s+(Mixed|Boys|Girls|Men|Women)\s", line):
+            continue
+
+        # Split on whitespace but preserve stroke name
+        parts = line.strip().split()
+        if len(parts) < 8:
+            continue  # skip malformed lines
+
+        # Extract fields
+        event_number = int(parts[0])
+        gender = parts[1]
+        age_group_parts = []
+        i = 2
+        # Capture age group until we find the yard/meter indicator
+        while i < len(parts) and not re.match(r"\d+(yd|m)", parts[i]):
+            age_group_parts.append(parts[i])
+            i += 1
+        if i == len(parts):
+            continue  # no distance on this line
+        age_group = " ".join(age_group_parts)
+
+        distance = re.match(r"(\d+)(yd|m)", parts[i]).group(0)
+        i += 1
+        stroke_parts = []
+        # Capture stroke name until we reach numbers (Entries, Heats, Time)
+        while i < len(parts) and not parts[i].isdigit():
+            stroke_parts.append(parts[i])
+            i += 1
+        stroke = " ".join(stroke_parts)
+
+        try:
+            entries = int(parts[i])
+            heats = int(parts[i + 1])
+            start_time = normalize_start_time(" ".join(parts[i + 2:i + 4]))
+        except (IndexError, ValueError):
+            continue  # malformed row
+
+        events.append(SessionEvent(event_number, gender, age_group, distance, stroke, entries, heats, start_time))
+
+    return events
+
+def parse_ocr_events(text, meet_title="Unknown Meet"):
+    """
+    Parse the OCR text of one page.  Event rows are ignored until a meet title
+    has been seen, so the running title is passed in and returned.
+    """
+    events = []
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        # Try to extract meet title if not already found
+        if line.startswith("Session Report") and "Page" in line:
+            try:
+                parts = line.split("Page")[0]  # Get everything before "Page"
+                title_part = parts.replace("Session Report", "").strip()
+                meet_title = sanitize_for_pdf(title_part)
+            except Exception as e:
+                print(f"Failed to extract title from: {line}")
+
+        if meet_title == "Unknown Meet":
+            continue
+
+        match = OCR_EVENT_PATTERN.match(line)
+        if match:
+            events.append(SessionEvent(
+                int(match.group(1)),
+                match.group(2),
+                match.group(3).strip(),
+                match.group(4),
+                match.group(5),
+                int(match.group(6)),
+                int(match.group(7)),
+                normalize_start_time(match.group(8))
+            ))
+
+    return events, meet_title
+
+def extract_events_by_page_with_ocr(pdf_path, page_numbers, meet_title=None):
+    """OCR only the given (1-based) pages.  Returns ({page: events}, meet_title)."""
+    return ocr_page_events([(pdf_path, page_numbers, meet_title)])[0]
+
+def ocr_page_events(jobs):
+    """
+    OCR the pages of several reports in one map_pages call.  jobs is [(pdf_path,
+    page_numbers, meet_title)]; returns [({page: events}, meet_title)].
+    """
+    jobs = [(pdf_path, sorted(page_numbers), meet_title) for pdf_path, page_numbers, meet_title in jobs]
+
+    # Pages are rendered and OCR'd one at a time per worker, and the text comes
+    # back in page order so the meet title and event order are deterministic.
+    texts = iter(map_pages(ocr_pdf_page, [
+        (pdf_path, page_number, None) for pdf_path, page_numbers, _ in jobs for page_number in page_numbers
+    ]))
+
+    results = []
+    for pdf_path, page_numbers, text_title in jobs:
+        page_events = {}
+        # Start from the text layer's title, so a page whose OCR'd header is misread keeps its rows
+        meet_title = text_title or "Unknown Meet"
+        for page_number in page_numbers:
+            text = next(texts)
+            print(f"\n--- OCR TEXT FROM PAGE {page_number} ---\n{text}\n")
+
+            events, meet_title = parse_ocr_events(text, meet_title)
+            if events:
+                page_events[page_number] = events
+        results.append((page_events, meet_title))
+
+    return results
+
+def extract_events_from_microsoft_pdf(pdf_path):
+    page_events, meet_title = extract_events_by_page_with_ocr(pdf_path, range(1, count_pages(pdf_path) + 1))
+    events = [event for page_number in sorted(page_events) for event in page_events[page_number]]
     return events, meet_title
 
 def sanitize_for_pdf(text: str) -> str:
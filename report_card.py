@@ -0,0 +1,362 @@
+import io
+import os
+import re
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from cache_utils import DiskCache, file_digest
+
+# Report cards kept loaded in this process, most recently used last
+REPORT_CARD_MEMORY_ENTRIES = int(os.environ.get("REPORT_CARD_MEMORY_ENTRIES", 8))
+
+# Report card tables on disk, so another worker (or a restart) between the
+# upload and the meet selection doesn't have to read the CSV again
+REPORT_CARD_CACHE_MAX_BYTES = int(os.environ.get("REPORT_CARD_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+REPORT_CARD_CACHE_MAX_AGE = int(os.environ.get("REPORT_CARD_CACHE_MAX_AGE", 7 * 24 * 60 * 60))
+
+# Bump whenever the report card table changes, so stale cache entries are ignored
+REPORT_CARD_VERSION = 7
+
+# Per-row columns of the report card, describing the swimmer and the event
+SWIMMER_COLUMNS = ["LastName", "FirstName", "LastName_FirstName", "AgeGroup"]
+EVENT_COLUMNS = ["EventDistance", "EventStroke"]
+
+# Per-meet columns read from the report card and their dtypes (-Place and the
+# rest are skipped).  Meet names and dates repeat down the report; -Result
+# stays as pandas reads it since the labels show it as written, and
+# -ResultSec and -Improved can hold a DQ or anything else, so read_report_csv
+# converts them once they're read
+MEET_DTYPES = {"Name": "category", "Date": "category", "Result": None, "ResultSec": None, "Improved": None}
+
+# The long table: one entry per report card row and meet with anything in
+# it.  swimmer and event are ids into the swimmer and event tables, meet the
+# meet's position in meet order, seconds the Result parsed to seconds, result
+# the Result text (index into the result strings, -1 for blank), improved the
+# -Improved flag (1 true, 0 false, -1 blank) and timed whether it has a -ResultSec
+RECORD_DTYPES = {
+    "row": np.int32,
+    "swimmer": np.int32,
+    "event": np.int32,
+    "meet": np.int16,
+    "seconds": np.float64,
+    "result": np.int32,
+    "improved": np.int8,
+    "timed": np.bool_,
+}
+
+_loaded = OrderedDict()
+_table_cache = None
+
+
+def clean_time(t):
+    return str(t).strip().rstrip("Y").strip()
+
+
+def parse_times(values):
+    """
+    Swim times ("1:05.32Y", "35.20") to float seconds, a whole column at a time.
+    DQs, blanks and anything else that isn't a time come back as NaN.
+    """
+    text = pd.Series(values).astype(str).str.strip().str.rstrip("Y").str.strip()
+    minutes_seconds = text.str.extract(r"^([^:]*):([^:]*)$")
+    split = pd.to_numeric(minutes_seconds[0], errors="coerce") * 60 + pd.to_numeric(minutes_seconds[1], errors="coerce")
+    whole = pd.to_numeric(text, errors="coerce")
+    return np.where(text.str.contains(":", regex=False), split, whole).astype(np.float64)
+
+
+def improved_flags(values):
+    """
+    -Improved cells to 1 (true), 0 (false) or -1 (blank or anything else, like
+    "Yes"), whether pandas read them as booleans or as text.
+    """
+    text = pd.Series(values).astype(str).str.strip().str.lower()
+    return np.where(text == "true", 1, np.where(text == "false", 0, -1)).astype(np.int8)
+
+
+def first_best(lines, seconds, meets):
+    """
+    Index of each line's fastest swim among these records (the earliest meet
+    on a tie), and the lines that have one.  Swims without a time are skipped.
+    """
+    timed = np.flatnonzero(~np.isnan(seconds))
+    order = timed[np.lexsort((meets[timed], seconds[timed], lines[timed]))]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = lines[order][1:] != lines[order][:-1]
+    return order[first], lines[order[first]]
+
+
+def meet_order(meet):
+    """Sort key for "MeetN", so Meet9 comes before Meet10."""
+    return int(meet.replace("Meet", ""))
+
+
+class MeetIndex:
+    """The meets of a report card in meet order, shared by the meet dropdown and every generator."""
+
+    def __init__(self, meets):
+        self.meets = [info["meet"] for info in meets]
+        self.position = {meet: i for i, meet in enumerate(self.meets)}
+        self.number = {meet: meet_order(meet) for meet in self.meets}
+        self.name = {info["meet"]: info["name"] for info in meets}
+        self.date = {info["meet"]: info["date"] for info in meets}
+        self.has_times = {info["meet"]: info["has_times"] for info in meets}
+        self.options = [
+            (meet, f"{self.name[meet]} — {self.date[meet]}" if self.name[meet] or self.date[meet] else meet)
+            for meet in self.meets if self.has_times[meet]
+        ]
+
+    def __contains__(self, meet):
+        return meet in self.position
+
+    def __iter__(self):
+        return iter(self.meets)
+
+    def __len__(self):
+        return len(self.meets)
+
+    # Slice of meets (and of the per-meet tables' columns) ahead of this one
+    def before(self, meet):
+        return slice(0, self.position.get(meet, 0))
+
+
+def json_values(series):
+    """A column as a JSON-friendly list, None for blanks."""
+    return [None if pd.isna(value) else value for value in series.tolist()]
+
+
+def read_report_csv(report_csv_path):
+    """Read just the columns read_report_table uses, in compact dtypes."""
+    header = pd.read_csv(report_csv_path, nrows=0).columns
+    usecols = []
+    dtypes = {}
+    for col in header:
+        field = col.split("-", 1)[-1]
+        if col in SWIMMER_COLUMNS or col in EVENT_COLUMNS:
+            usecols.append(col)
+            if col != "EventDistance":
+                dtypes[col] = "category"
+        elif col.startswith("Meet") and field in MEET_DTYPES:
+            usecols.append(col)
+            if MEET_DTYPES[field] is not None:
+                dtypes[col] = MEET_DTYPES[field]
+    df = pd.read_csv(report_csv_path, usecols=usecols, dtype=dtypes)
+
+    for col in [col for col in df.columns if col.endswith("-ResultSec")]:
+        df[col.replace("-ResultSec", "-Entered")] = df[col].notna()
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float32)
+    for col in [col for col in df.columns if col.endswith("-Improved")]:
+        df[col] = improved_flags(df[col])
+    return df
+
+
+def read_report_table(report_csv_path):
+    """
+    Reshape a report card CSV (a row per swimmer and event, columns per meet) into the
+    long table.  Returns (records, meta).
+    """
+    df = read_report_csv(report_csv_path)
+
+    meet_numbers = sorted({col.split("-")[0] for col in df.columns if "ResultSec" in col}, key=meet_order)
+
+    swimmer_columns = [col for col in SWIMMER_COLUMNS if col in df.columns]
+    event_columns = [col for col in EVENT_COLUMNS if col in df.columns]
+    swimmer = df.groupby(swimmer_columns, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+    event = df.groupby(event_columns, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+    swimmers = df[swimmer_columns].drop_duplicates()
+    events = df[event_columns].drop_duplicates()
+
+    blank = pd.Series(np.nan, index=df.index, dtype=object)
+    no_flag = pd.Series(-1, index=df.index, dtype=np.int8)
+    meets = []
+    results = {}
+    parts = {col: [] for col in RECORD_DTYPES}
+    for position, meet in enumerate(meet_numbers):
+        result = df.get(f"{meet}-Result", blank)
+        entered = df[f"{meet}-Entered"]
+        improved = df.get(f"{meet}-Improved", no_flag)
+
+        title = df.get(f"{meet}-Name", blank).dropna().tolist()
+        date = df.get(f"{meet}-Date", blank).dropna().tolist()
+        meets.append({
+            "meet": meet,
+            "name": title[0] if title else "",
+            "date": date[0] if date else "",
+            "has_times": bool(df[f"{meet}-ResultSec"].notna().any())
+        })
+
+        present = (result.notna() | entered | (improved != -1)).to_numpy()
+        rows = np.flatnonzero(present)
+        text = result[present]
+        parts["row"].append(rows)
+        parts["swimmer"].append(swimmer[rows])
+        parts["event"].append(event[rows])
+        parts["meet"].append(np.full(len(rows), position))
+        parts["seconds"].append(parse_times(text))
+        parts["result"].append(np.array(
+            [results.setdefault(str(value), len(results)) if pd.notna(value) else -1 for value in text]
+        ))
+        parts["improved"].append(improved[present].to_numpy())
+        parts["timed"].append(entered[present].to_numpy())
+
+    records = {
+        col: np.concatenate(parts[col]).astype(dtype) if parts[col] else np.zeros(0, dtype)
+        for col, dtype in RECORD_DTYPES.items()
+    }
+    meta = {
+        "rows": len(df),
+        "swimmers": {col: json_values(swimmers[col]) for col in swimmer_columns},
+        "events": {col: json_values(events[col]) for col in event_columns},
+        "meets": meets,
+        "results": list(results),
+    }
+    return records, meta
+
+
+class ReportCard:
+    """A report card, read once at upload and shared by every award generator."""
+
+    def __init__(self, records, meta, token=None):
+        self.records = records
+        self.token = token
+
+        self.meets = MeetIndex(meta["meets"])
+
+        # Records come meet by meet in meet order (read_report_table), so a
+        # meet's records, and the ones before it, are a slice
+        self.meet_start = np.searchsorted(records["meet"], np.arange(len(self.meets) + 1))
+
+        # One line per row with a swim, in row order; line is each record's line
+        row_numbers, self.line = np.unique(records["row"], return_inverse=True)
+        swimmer = np.zeros(len(row_numbers), dtype=np.int64)
+        swimmer[self.line] = records["swimmer"]
+        event = np.zeros(len(row_numbers), dtype=np.int64)
+        event[self.line] = records["event"]
+        swimmers = pd.DataFrame(meta["swimmers"])
+        events = pd.DataFrame(meta["events"])
+        self.rows = pd.concat(
+            [swimmers.iloc[swimmer].reset_index(drop=True), events.iloc[event].reset_index(drop=True)],
+            axis=1
+        ).set_axis(row_numbers)
+        self.rows = self.rows.where(self.rows.notna(), np.nan)
+
+        self.result_strings = np.array(meta["results"], dtype=object)
+
+    def swims(self, meet):
+        """
+        A meet's columns lined up with rows: seconds, improved, prior_best (with its meet and
+        result) and has_prior_time.
+        """
+        records = self.records
+        position = self.meets.position[meet]
+        start, end = self.meet_start[position], self.meet_start[position + 1]
+        count = len(self.rows)
+
+        here = self.line[start:end]
+        seconds = np.full(count, np.nan)
+        seconds[here] = records["seconds"][start:end]
+        improved = np.full(count, -1, dtype=np.int8)
+        improved[here] = records["improved"][start:end]
+
+        earlier = self.line[:start]
+        has_prior_time = np.zeros(count, dtype=bool)
+        has_prior_time[earlier[np.asarray(records["timed"][:start])]] = True
+
+        best, lines = first_best(earlier, np.asarray(records["seconds"][:start]), np.asarray(records["meet"][:start]))
+        prior_best = np.full(count, np.nan)
+        prior_best[lines] = records["seconds"][best]
+        prior_best_meet = np.full(count, -1, dtype=np.int64)
+        prior_best_meet[lines] = records["meet"][best]
+        prior_best_result = np.full(count, -1, dtype=np.int64)
+        prior_best_result[lines] = records["result"][best]
+
+        return {
+            "seconds": seconds,
+            "improved": improved,
+            "prior_best": prior_best,
+            "prior_best_meet": prior_best_meet,
+            "prior_best_result": prior_best_result,
+            "has_prior_time": has_prior_time,
+        }
+
+    @classmethod
+    def from_csv(cls, report_csv_path):
+        return cls(*read_report_table(report_csv_path), token=file_digest(report_csv_path))
+
+
+def as_report_card(report):
+    """Accept a ReportCard or the path of a report card CSV."""
+    return report if isinstance(report, ReportCard) else ReportCard.from_csv(report)
+
+
+def get_report_card_cache():
+    """Cache of each report card's long table columns and meta, evicted a report card at a time."""
+    global _table_cache
+    if _table_cache is None:
+        _table_cache = DiskCache(
+            "report_cards", REPORT_CARD_CACHE_MAX_BYTES, REPORT_CARD_CACHE_MAX_AGE, suffix="",
+            group=lambda name: name.split("-")[0]
+        )
+    return _table_cache
+
+
+def write_report_table_cache(token, records, meta):
+    cache = get_report_card_cache()
+    for col in RECORD_DTYPES:
+        buffer = io.BytesIO()
+        np.save(buffer, records[col], allow_pickle=False)
+        cache.set(f"{token}-v{REPORT_CARD_VERSION}-{col}.npy", buffer.getvalue())
+    # Written last, so whoever finds it finds the columns too
+    cache.set_json(f"{token}-v{REPORT_CARD_VERSION}.json", meta)
+
+
+def read_report_table_cache(token):
+    """(records, meta) cached for a report card, with the columns memory-mapped, or None."""
+    cache = get_report_card_cache()
+    meta = cache.get_json(f"{token}-v{REPORT_CARD_VERSION}.json")
+    if meta is None:
+        return None
+    records = {}
+    for col in RECORD_DTYPES:
+        path = cache.get_path(f"{token}-v{REPORT_CARD_VERSION}-{col}.npy")
+        if path is None:
+            return None
+        records[col] = np.load(path, mmap_mode="r", allow_pickle=False)
+    return records, meta
+
+
+def remember(token, report_card):
+    _loaded[token] = report_card
+    _loaded.move_to_end(token)
+    while len(_loaded) > REPORT_CARD_MEMORY_ENTRIES:
+        _loaded.popitem(last=False)
+
+
+def load_report_card(report_csv_path):
+    """Read an uploaded report card and cache it by the SHA-256 of the CSV.  Returns (token, report_card)."""
+    token = file_digest(report_csv_path)
+    report_card = get_report_card(token)
+    if report_card is None:
+        records, meta = read_report_table(report_csv_path)
+        write_report_table_cache(token, records, meta)
+        report_card = ReportCard(records, meta, token)
+        print(f"📇 Loaded report card {os.path.basename(report_csv_path)} ({token[:12]}, {len(records['row'])} swims)")
+    remember(token, report_card)
+    return token, report_card
+
+
+def get_report_card(token):
+    """The report card uploaded with this token, or None if it has expired."""
+    if not re.fullmatch(r"[0-9a-f]{64}", token or ""):
+        return None
+    if token in _loaded:
+        _loaded.move_to_end(token)
+        return _loaded[token]
+
+    cached = read_report_table_cache(token)
+    if cached is None:
+        return None
+    report_card = ReportCard(*cached, token=token)
+    remember(token, report_card)
+    return report_card
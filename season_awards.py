@@ -0,0 +1,74 @@
+import os
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from award_rules import evaluate_awards
+from render_labels import render_label_pdf
+
+# Award type -> name, in the order the files come out
+AWARD_TYPES = {
+    "time_improvement": "Time Improvement",
+    "triple_drop": "Triple Drop",
+    "fast_fishy": "Fast Fishy",
+}
+
+# Each meet's summary starts on a new page of the season report
+PAGE_BREAK = '<div style="page-break-before: always"></div>'
+
+_templates = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")),
+    autoescape=select_autoescape()
+)
+
+
+def season_awards(report_card, award_types=AWARD_TYPES):
+    """
+    Every award for every meet with times, in meet order.
+    Returns {award_type: [{"meet", "meet_title", "labels", "rankings"}, ...]}.
+    """
+    meets = report_card.meets
+    awards = {award_type: [] for award_type in award_types}
+    winners = set()
+
+    for meet in meets:
+        if not meets.has_times[meet]:
+            if "fast_fishy" in awards:
+                evaluate_awards(report_card, meet, ["fast_fishy"], winners)
+            continue
+
+        meet_title = f"{meets.name[meet]} - {meets.date[meet]}"
+        for award_type, meet_awards in evaluate_awards(report_card, meet, list(awards), winners).items():
+            awards[award_type].append({
+                "meet": meet,
+                "meet_title": meet_title,
+                "labels": meet_awards["labels"],
+                "rankings": meet_awards["rankings"]
+            })
+
+    return awards
+
+
+def write_season_awards(awards, output_prefix):
+    """
+    A label PDF and a report PDF per award type, every meet in order.
+    Returns [(award_type, label_pdf, report_pdf, label_count)].
+    """
+    # parse_utils pulls in weasyprint, so computing awards doesn't need the PDF stack
+    from parse_utils import save_html_as_pdf
+
+    files = []
+    for award_type, meet_awards in awards.items():
+        labels = [label for meet in meet_awards for label in meet["labels"]]
+        label_pdf = f"{output_prefix}_{award_type}.pdf"
+        render_label_pdf(labels, label_pdf)
+
+        template = _templates.get_template(f"{award_type}_summary.html")
+        html = PAGE_BREAK.join(
+            template.render(label_data=meet["labels"], rankings=meet["rankings"], meet_title=meet["meet_title"])
+            for meet in meet_awards
+        )
+        report_pdf = f"{output_prefix}_{award_type}_report.pdf"
+        save_html_as_pdf(html, report_pdf)
+
+        files.append((award_type, label_pdf, report_pdf, len(labels)))
+    return files
@@ -0,0 +1,72 @@
+import sys
+
+
+class SessionEvent:
+    """
+    One event row of a session report, as every parser returns it.
+    It reads like the dicts the parsers used to return; to_dict/from_dict are for JSON.
+    """
+
+    __slots__ = ("number", "gender", "age_group", "distance", "stroke", "entries", "heats", "start")
+
+    # Report column -> attribute, in column order
+    FIELDS = {
+        "Event #": "number",
+        "Gender": "gender",
+        "Age Group": "age_group",
+        "Distance": "distance",
+        "Stroke": "stroke",
+        "Entries": "entries",
+        "Heats": "heats",
+        "Est. Start": "start",
+    }
+
+    def __init__(self, number, gender, age_group, distance, stroke, entries, heats, start=""):
+        self.number = int(number)
+        self.gender = sys.intern(gender)
+        self.age_group = sys.intern(age_group)
+        self.distance = sys.intern(distance)
+        self.stroke = sys.intern(stroke)
+        self.entries = int(entries)
+        self.heats = int(heats)
+        self.start = start
+
+    @classmethod
+    def from_dict(cls, row):
+        return cls(*(row.get(column, "") for column in cls.FIELDS))
+
+    def to_dict(self):
+        return {column: getattr(self, name) for column, name in self.FIELDS.items()}
+
+    def __getitem__(self, column):
+        return getattr(self, self.FIELDS[column])
+
+    def get(self, column, default=None):
+        name = self.FIELDS.get(column)
+        return getattr(self, name) if name else default
+
+    def keys(self):
+        return self.FIELDS.keys()
+
+    def values(self):
+        return [getattr(self, name) for name in self.FIELDS.values()]
+
+    def items(self):
+        return zip(self.FIELDS, self.values())
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __contains__(self, column):
+        return column in self.FIELDS
+
+    def __eq__(self, other):
+        if not isinstance(other, SessionEvent):
+            return NotImplemented
+        return self.values() == other.values()
+
+    def __repr__(self):
+        return f"SessionEvent({', '.join(repr(value) for value in self.values())})"
@@ -0,0 +1,139 @@
+import os
+import re
+
+import numpy as np
+
+# A gap between events longer than this many typical heats is a break (lunch,
+# warm-ups for the next session) rather than a slow event
+TIMELINE_BREAK_FACTOR = float(os.environ.get("TIMELINE_BREAK_FACTOR", 4))
+
+START_TIME = re.compile(r"^(\d{1,2}):(\d{2})(?: ([AP]M))?$")
+
+
+def normalize_start_time(text):
+    """'9:05AM' / '9:05 am' -> '9:05 AM'.  OCR can lose the AM/PM, which is left off."""
+    match = re.match(r"(\d{1,2}:\d{2})\s*([AaPp][Mm])?", text.strip())
+    if not match:
+        return ""
+    if match.group(2):
+        return f"{match.group(1)} {match.group(2).upper()}"
+    return match.group(1)
+
+
+def start_minutes(events):
+    """Est. Start of each event in minutes after midnight, NaN where it's missing."""
+    minutes = np.full(len(events), np.nan)
+    previous = None
+    for i, event in enumerate(events):
+        match = START_TIME.match(event.start)
+        if not match:
+            continue
+        value = int(match.group(1)) % 12 * 60 + int(match.group(2))
+        if match.group(3) == "PM":
+            value += 12 * 60
+        elif match.group(3) is None and previous is not None:
+            # No AM/PM: take the half of the day that keeps the schedule moving forward
+            later = [v for v in (value, value + 12 * 60) if v >= previous]
+            value = min(later) if later else value
+        minutes[i] = previous = value
+    return minutes
+
+
+def format_minutes(minutes):
+    minutes = int(round(minutes)) % (24 * 60)
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def session_timeline(events):
+    """
+    Minutes per heat and session boundaries from the Est. Start times, or None without them.
+    Returns {"heat", "session", "start", "end"}.
+    """
+    start = start_minutes(events)
+    timed = np.flatnonzero(~np.isnan(start))
+    if len(timed) == 0:
+        return None
+
+    heats = np.array([max(event.heats, 1) for event in events], dtype=np.float64)
+    heats_before = np.concatenate(([0.0], np.cumsum(heats)))
+
+    # Each timed event owns the heats up to the next timed event
+    span_end = np.append(timed[1:], len(events))
+    span_heats = heats_before[span_end] - heats_before[timed]
+    gap = np.append(start[timed[1:]] - start[timed[:-1]], np.nan)
+    per_heat = gap / span_heats
+
+    # Start times that go backwards, or a gap of many typical heats, start a new session
+    forward = per_heat[per_heat > 0]
+    typical = np.median(forward) if len(forward) else np.nan
+    new_session = (gap < 0) | (per_heat > TIMELINE_BREAK_FACTOR * typical)
+    per_heat[new_session] = np.nan
+
+    # Spans closing a session: typical heat time for the distance, else overall
+    distances = np.array([events[i].distance for i in timed])
+    for distance in np.unique(distances[np.isnan(per_heat)]):
+        known = per_heat[(distances == distance) & ~np.isnan(per_heat)]
+        fill = np.median(known) if len(known) else typical
+        per_heat[np.isnan(per_heat) & (distances == distance)] = fill
+    per_heat = np.nan_to_num(per_heat, nan=0.0)
+
+    owner = np.searchsorted(timed, np.arange(len(events)), side="right") - 1
+    owner = np.maximum(owner, 0)  # events before the first start time join the first span
+    heat = per_heat[owner]
+
+    span_session = np.concatenate(([0], np.cumsum(new_session[:-1])))
+    session = span_session[owner]
+    session_count = int(span_session[-1]) + 1
+
+    session_start = np.full(session_count, np.inf)
+    session_end = np.full(session_count, -np.inf)
+    np.minimum.at(session_start, span_session, start[timed])
+    np.maximum.at(session_end, span_session, start[timed] + span_heats * per_heat)
+
+    return {"heat": heat, "session": session, "start": session_start, "end": session_end}
+
+
+def project_combos(timeline, combo_sets):
+    """
+    Minutes each session gets shorter under each set of (female, male) combos,
+    as a (len(combo_sets), sessions) array.
+    """
+    saved = np.zeros((len(combo_sets), len(timeline["start"])))
+    config = np.repeat(np.arange(len(combo_sets)), [len(combos) for combos in combo_sets])
+    combos = np.array([combo for combos in combo_sets for combo in combos], dtype=np.int64).reshape(-1, 2)
+    if len(combos) == 0:
+        return saved
+
+    # A combo drops the male event's first heat, and the female event's last heat
+    # takes as long as the slower of the two
+    female_heat = timeline["heat"][combos[:, 0]]
+    male_heat = timeline["heat"][combos[:, 1]]
+    np.add.at(saved, (config, timeline["session"][combos[:, 1]]), male_heat)
+    np.add.at(saved, (config, timeline["session"][combos[:, 0]]), female_heat - np.maximum(female_heat, male_heat))
+    return saved
+
+
+def project_sweep(events, sweep):
+    """Add each session's scheduled and projected times to a sweep_combos result."""
+    timeline = session_timeline(events)
+    if timeline is None:
+        return sweep
+
+    keys = list(sweep["configs"])
+    saved = project_combos(timeline, [sweep["configs"][key]["combos"] for key in keys])
+    projected_end = timeline["end"][None, :] - saved
+
+    sweep["sessions"] = [
+        {"start": format_minutes(start), "end": format_minutes(end)}
+        for start, end in zip(timeline["start"], timeline["end"])
+    ]
+    for k, key in enumerate(keys):
+        sweep["configs"][key]["timeline"] = {
+            "minutes_saved": round(float(saved[k].sum()), 1),
+            "sessions": [
+                {"projected_end": format_minutes(end), "minutes_saved": round(float(minutes), 1)}
+                for end, minutes in zip(projected_end[k], saved[k])
+            ],
+        }
+    return sweep
@@ -0,0 +1,86 @@
+import json
+import os
+
+import pytest
+
+import cache_utils
+import generate_fast_fishy_labels as fast_fishy_module
+import report_card as report_card_module
+from generate_fast_fishy_labels import generate_fast_fishy_labels
+from generate_time_improvement_labels import generate_time_improvement_labels
+from generate_triple_drop_labels import generate_triple_drop_labels
+from report_card import ReportCard, get_report_card, load_report_card
+from season_awards import season_awards
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+REPORT_CARD = os.path.join(FIXTURES, "report_card.csv")
+
+# Labels and rankings for every meet of report_card.csv, as the generators made
+# them before ReportCard (meets in numeric order, and no KeyError for Triple
+# Drop at a meet nobody has a time before).  The report card has 11 meets, the
+# last without times, DQs, "Y" times, repeat winners and an age group with a
+# single swimmer.
+with open(os.path.join(FIXTURES, "report_card_awards.json")) as f:
+    EXPECTED = json.load(f)
+
+MEETS = list(EXPECTED)
+
+
+def as_json(value):
+    return json.loads(json.dumps(value, default=str))
+
+
+@pytest.fixture(autouse=True)
+def cache_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_utils, "CACHE_FOLDER", str(tmp_path))
+    monkeypatch.setattr(fast_fishy_module, "_winner_cache", None)
+    monkeypatch.setattr(report_card_module, "_table_cache", None)
+    monkeypatch.setattr(report_card_module, "_loaded", report_card_module.OrderedDict())
+
+
+@pytest.fixture(scope="module")
+def report_card():
+    return ReportCard.from_csv(REPORT_CARD)
+
+
+def check_meet(report, meet):
+    expected = EXPECTED[meet]
+    assert as_json(generate_time_improvement_labels(report, meet)) == expected["time_improvement"]
+    assert as_json(generate_triple_drop_labels(report, meet)) == expected["triple_drop"]
+    labels, _, rankings = generate_fast_fishy_labels(report, meet)
+    assert as_json(labels) == expected["fast_fishy"]
+    assert as_json(rankings) == expected["fast_fishy_rankings"]
+
+
+@pytest.mark.parametrize("meet", MEETS)
+def test_meet_labels(report_card, meet):
+    # A fresh cache folder per meet, so Fast Fishy works out the winners from the start
+    check_meet(report_card, meet)
+
+
+def test_meet_labels_with_warm_winner_cache(report_card):
+    for meet in MEETS + MEETS[::-1]:
+        check_meet(report_card, meet)
+
+
+def test_meet_labels_from_csv_path():
+    check_meet(REPORT_CARD, "Meet10")
+
+
+def test_meet_labels_from_cached_report_card():
+    token, _ = load_report_card(REPORT_CARD)
+    report_card_module._loaded.clear()
+    cached = get_report_card(token)
+    assert cached is not None
+    for meet in MEETS:
+        check_meet(cached, meet)
+
+
+def test_season_awards(report_card):
+    awards = season_awards(report_card)
+    for award_type, meet_awards in awards.items():
+        assert [meet["meet"] for meet in meet_awards] == MEETS[:-1]
+        for meet in meet_awards:
+            assert as_json(meet["labels"]) == EXPECTED[meet["meet"]][award_type]
+    for meet in awards["fast_fishy"]:
+        assert as_json(meet["rankings"]) == EXPECTED[meet["meet"]]["fast_fishy_rankings"]
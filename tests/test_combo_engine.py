@@ -0,0 +1,166 @@
+import itertools
+import random
+
+import pytest
+
+from combo_engine import (
+    AGGRESSIVENESS_OPTIONS,
+    LANE_OPTIONS,
+    evaluate_combos,
+    max_bipartite_matching,
+    sweep_combos,
+)
+from session_event import SessionEvent
+
+# Every combo outcome once: a combo, a full heat, zero entries, too many
+# swimmers, no male event and a relay
+SESSION = [
+    SessionEvent(1, "Girls", "9-10", "50yd", "Freestyle", 8, 2),
+    SessionEvent(2, "Boys", "9-10", "50yd", "Freestyle", 3, 1),
+    SessionEvent(3, "Girls", "11-12", "50yd", "Freestyle", 6, 1),
+    SessionEvent(4, "Boys", "11-12", "50yd", "Freestyle", 2, 1),
+    SessionEvent(5, "Girls", "8 & Under", "25yd", "Backstroke", 0, 0),
+    SessionEvent(6, "Boys", "8 & Under", "25yd", "Backstroke", 4, 1),
+    SessionEvent(7, "Women", "13-14", "100yd", "IM", 5, 1),
+    SessionEvent(8, "Men", "13-14", "100yd", "IM", 4, 1),
+    SessionEvent(9, "Girls", "15-18", "50yd", "Butterfly", 3, 1),
+    SessionEvent(10, "Mixed", "9-10", "200yd", "Freestyle Relay", 4, 1),
+]
+
+# Two girls events reaching for the same boys event, and a boys event number
+# printed twice
+SHARED = [
+    SessionEvent(1, "Girls", "9-10", "50yd", "Freestyle", 2, 1),
+    SessionEvent(2, "Girls", "9-10", "50yd", "Freestyle", 3, 1),
+    SessionEvent(3, "Boys", "9-10", "50yd", "Freestyle", 2, 1),
+    SessionEvent(3, "Boys", "9-10", "50yd", "Freestyle", 1, 1),
+]
+
+
+def random_session(rnd, count=30):
+    groups = [("9-10", "50yd", "Freestyle"), ("9-10", "25yd", "Backstroke"), ("11-12", "50yd", "Freestyle")]
+    events = []
+    for number in range(1, count + 1):
+        gender = rnd.choice(["Girls", "Boys", "Women", "Men", "Mixed"])
+        if rnd.random() < 0.1:
+            number -= 1  # a repeated event number
+        events.append(SessionEvent(number, gender, *rnd.choice(groups), rnd.randint(0, 14), 1))
+    return events
+
+
+def table_rows(events, table):
+    positions = {id(event): i for i, event in enumerate(events)}
+    return [[positions[id(row.event)], row["Can Combine?"], row["Reason"], row.get("_highlight_partner", False)]
+            for row in table]
+
+
+def test_combo_table():
+    pairs, table = evaluate_combos(SESSION, lanes=6, aggressiveness=1)
+    assert [(row["Event #"], row["Can Combine?"], row["Reason"]) for row in table] == [
+        (1, "Yes", "2 swimmers"),
+        (2, "", "3 swimmers"),
+        (3, "No", "One event fills all lanes"),
+        (4, "", ""),
+        (5, "No", "One event has 0 entries"),
+        (6, "", ""),
+        (7, "No", "Too many remainder swimmers"),
+        (8, "", ""),
+        (9, "No", "No male counterpart"),
+        (10, "", ""),
+    ]
+    assert table[1]["_highlight_partner"] is True
+    assert pairs == [{
+        "Female Event #": 1,
+        "Female Age": "Girls 9-10",
+        "Female Heat #": 2,
+        "Female # Swimmers": 2,
+        "combine with": "combine with",
+        "Male Event #": 2,
+        "Male Age": "Boys 9-10",
+        "Male Heat #": 1,
+        "Male # Swimmers": 3,
+        "Distance": "50yd",
+        "Stroke": "Freestyle",
+    }]
+
+    pairs, table = evaluate_combos(SESSION, lanes=6, aggressiveness=3)
+    assert pairs == []
+    assert (table[0]["Can Combine?"], table[0]["Reason"]) == ("No", "Combo strategy too conservative")
+
+
+def test_combo_table_shared_male_event():
+    pairs, table = evaluate_combos(SHARED, lanes=6, aggressiveness=1)
+    assert [(p["Female Event #"], p["Male Event #"], p["Male # Swimmers"]) for p in pairs] == [
+        (1, 3, 2), (1, 3, 1), (2, 3, 2), (2, 3, 1)
+    ]
+    # The second boys event 3 counts as already combined, so it drops out of the table
+    assert table_rows(SHARED, table) == [
+        [0, "Yes", "2 swimmers", False],
+        [2, "", "2 swimmers", True],
+        [1, "No", "No male counterpart", False],
+    ]
+
+
+@pytest.mark.parametrize("events", [SESSION, SHARED] + [random_session(random.Random(seed)) for seed in range(20)])
+def test_sweep_matches_evaluate_combos(events):
+    sweep = sweep_combos(events)
+    for lanes in LANE_OPTIONS:
+        for aggressiveness in AGGRESSIVENESS_OPTIONS:
+            config = sweep["configs"][f"{lanes}-{aggressiveness}"]
+            pairs, table = evaluate_combos(events, lanes, aggressiveness)
+            rows = table_rows(events, table)
+            assert config["rows"] == rows
+            assert config["combo_count"] == len(pairs)
+            assert [[events[f]["Event #"], events[m]["Event #"]] for f, m in config["pairs"]] == \
+                [[pair["Female Event #"], pair["Male Event #"]] for pair in pairs]
+            assert config["combos"] == [[row[0], rows[k + 1][0]] for k, row in enumerate(rows) if row[1] == "Yes"]
+
+
+@pytest.mark.parametrize("events", [SESSION, SHARED] + [random_session(random.Random(seed)) for seed in range(20)])
+def test_optimal_combos(events):
+    sweep = sweep_combos(events, optimize=True)
+    for lanes in LANE_OPTIONS:
+        for aggressiveness in AGGRESSIVENESS_OPTIONS:
+            greedy_pairs, greedy_table = evaluate_combos(events, lanes, aggressiveness)
+            pairs, table = evaluate_combos(events, lanes, aggressiveness, optimize=True)
+            greedy_count = sum(row["Can Combine?"] == "Yes" for row in greedy_table)
+
+            # Each combo is a compatible pair, no event is in two, and there's no better choice
+            positions = {id(event): i for i, event in enumerate(events)}
+            compatible = {(events[f]["Event #"], events[m]["Event #"]) for f, m in
+                          sweep_combos(events, [lanes], [aggressiveness])["configs"][f"{lanes}-{aggressiveness}"]["pairs"]}
+            assert {(p["Female Event #"], p["Male Event #"]) for p in pairs} <= compatible
+            assert len(pairs) >= greedy_count
+            assert len(pairs) == sum(row["Can Combine?"] == "Yes" for row in table)
+
+            config = sweep["configs"][f"{lanes}-{aggressiveness}"]
+            assert config["rows"] == table_rows(events, table)
+            assert config["combo_count"] == len(pairs)
+            assert len({positions[id(row.event)] for row in table}) == len(table)
+
+
+def brute_force_matching(adjacency):
+    edges = [(left, right) for left, rights in adjacency.items() for right in rights]
+    for size in range(min(len(adjacency), len(edges)), 0, -1):
+        for chosen in itertools.combinations(edges, size):
+            lefts, rights = zip(*chosen)
+            if len(set(lefts)) == size and len(set(rights)) == size:
+                return size
+    return 0
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_max_bipartite_matching(seed):
+    rnd = random.Random(seed)
+    adjacency = {left: rnd.sample(range(6), rnd.randint(0, 3)) for left in range(rnd.randint(1, 6))}
+    matching = max_bipartite_matching(adjacency)
+    assert all(right in adjacency[left] for left, right in matching.items())
+    assert len(set(matching.values())) == len(matching)
+    assert len(matching) == brute_force_matching(adjacency)
+
+
+def test_optimal_combos_shared_male_event():
+    pairs, table = evaluate_combos(SHARED, lanes=6, aggressiveness=1, optimize=True)
+    # Greedy gives both boys events 3 to the first girls event; optimal pairs up both
+    assert sorted((p["Female Event #"], p["Male # Swimmers"]) for p in pairs) in ([(1, 1), (2, 2)], [(1, 2), (2, 1)])
+    assert [row["Can Combine?"] for row in table if row["Can Combine?"]] == ["Yes", "Yes"]
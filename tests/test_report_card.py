@@ -0,0 +1,64 @@
+import numpy as np
+
+from report_card import ReportCard, read_report_csv, read_report_table
+
+HEADER = ("LastName,FirstName,LastName_FirstName,AgeGroup,EventDistance,EventStroke,"
+          "Meet1-Name,Meet1-Date,Meet1-Result,Meet1-ResultSec,Meet1-Improved,"
+          "Meet2-Name,Meet2-Date,Meet2-Result,Meet2-ResultSec,Meet2-Improved")
+
+
+def write_csv(tmp_path, *rows):
+    path = tmp_path / "report_card.csv"
+    path.write_text("\n".join([HEADER, *rows]) + "\n")
+    return str(path)
+
+
+def test_dq_in_result_sec(tmp_path):
+    path = write_csv(
+        tmp_path,
+        "Fish,Ann,\"Fish, Ann\",09-10 Girls,50,Free,Opener,6/1,DQ,DQ,,Dual,6/8,39.00,39.00,False",
+        "Fish,Ann,\"Fish, Ann\",09-10 Girls,50,Back,Opener,6/1,50.00,50.00,,Dual,6/8,48.00,48.00,True",
+    )
+    df = read_report_csv(path)
+    assert df["Meet1-ResultSec"].dtype == np.float32
+    assert np.isnan(df.at[0, "Meet1-ResultSec"]) and df.at[1, "Meet1-ResultSec"] == 50.0
+    assert df["Meet1-Entered"].tolist() == [True, True]
+
+    records, meta = read_report_table(path)
+    assert [meet["has_times"] for meet in meta["meets"]] == [True, True]
+
+    card = ReportCard(records, meta)
+    assert np.isnan(card.swims("Meet1")["seconds"][0])
+    meet2 = card.swims("Meet2")
+    assert meet2["seconds"][1] == 48.0
+    # A DQ isn't a best time, but it's still an earlier entry, as it always was for Triple Drop
+    assert np.isnan(meet2["prior_best"][0])
+    assert meet2["has_prior_time"][0]
+
+
+def test_improved_flags(tmp_path):
+    path = write_csv(
+        tmp_path,
+        "Fish,Ann,\"Fish, Ann\",09-10 Girls,50,Free,Opener,6/1,40.00,40.00,,Dual,6/8,39.00,39.00,True",
+        "Fish,Ann,\"Fish, Ann\",09-10 Girls,50,Back,Opener,6/1,50.00,50.00,,Dual,6/8,48.00,48.00,Yes",
+        "Fish,Ann,\"Fish, Ann\",09-10 Girls,50,Fly,Opener,6/1,55.00,55.00,,Dual,6/8,56.00,56.00,False",
+        "Fish,Ann,\"Fish, Ann\",09-10 Girls,25,Free,Opener,6/1,20.00,20.00,,Dual,6/8,19.00,19.00,",
+    )
+    assert read_report_csv(path)["Meet2-Improved"].tolist() == [1, -1, 0, -1]
+    card = ReportCard.from_csv(path)
+    assert card.swims("Meet2")["improved"].tolist() == [1, -1, 0, -1]
+    assert card.swims("Meet1")["improved"].tolist() == [-1, -1, -1, -1]
+
+
+def test_meets_in_numeric_order(tmp_path):
+    header = ",".join(["LastName,FirstName,LastName_FirstName,AgeGroup,EventDistance,EventStroke"] + [
+        f"Meet{n}-Name,Meet{n}-Date,Meet{n}-Result,Meet{n}-ResultSec,Meet{n}-Improved" for n in (10, 2, 1)
+    ])
+    path = tmp_path / "report_card.csv"
+    path.write_text(header + "\nFish,Ann,\"Fish, Ann\",09-10 Girls,50,Free,"
+                    "Ten,7/30,38.00,38.00,True,Two,6/8,39.00,39.00,True,One,6/1,40.00,40.00,\n")
+    card = ReportCard.from_csv(str(path))
+    assert card.meets.meets == ["Meet1", "Meet2", "Meet10"]
+    meet10 = card.swims("Meet10")
+    assert meet10["prior_best"][0] == 39.0
+    assert card.meets.meets[meet10["prior_best_meet"][0]] == "Meet2"